@@ -0,0 +1,5 @@
+"""
+Benchmarks for Finite State Machines, run from the repository root as
+    python -m benchmarks              the suite of benchmarks.suite, as JSON
+    python -m benchmarks.<name>       a single benchmark script
+"""
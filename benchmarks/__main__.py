@@ -0,0 +1,20 @@
+"""
+Runs the benchmark suite and writes its results as JSON,
+    python -m benchmarks [--quick] [--repeat N] [--output FILE]
+"""
+
+import argparse
+import json
+
+from benchmarks.suite import run_suite
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite of Finite State Machines")
+    parser.add_argument("--quick", action="store_true", help="run the small size sweeps")
+    parser.add_argument("--repeat", type=int, default=3, help="timings per measurement")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    args = parser.parse_args()
+    report = run_suite(args.quick, args.repeat)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
@@ -0,0 +1,96 @@
+"""
+Seeded generators of random and worst-case automata for the benchmarks
+"""
+
+import random
+
+from finstatemach import DFA, NFA
+
+def symbols_of(alphabet_size):
+    """
+    Returns the alphabet of a given size, as the single characters '0', '1', ...
+    """
+    return {chr(ord('0') + idx) for idx in range(alphabet_size)}
+
+def random_DFA(num_states, alphabet_size=2, accept_density=0.5, seed=0):
+    """
+    Returns a random complete DFA with states 0..num_states-1, where every
+        transition goes to a uniformly random state and every state is
+        accepting with probability accept_density
+    """
+    rng = random.Random(seed)
+    alphabet = sorted(symbols_of(alphabet_size))
+    transition = {state: {symbol: rng.randrange(num_states) for symbol in alphabet}
+                  for state in range(num_states)}
+    accept_states = {state for state in range(num_states) if rng.random() < accept_density}
+    return DFA(range(num_states), alphabet, transition, 0, accept_states)
+
+def redundant_DFA(num_states, alphabet_size=2, seed=0):
+    """
+    Returns a random complete DFA with states 0..num_states-1 whose transitions
+        stay among a few equivalent copies of a smaller DFA, so that
+        minimization has work to do
+    """
+    rng = random.Random(seed)
+    alphabet = sorted(symbols_of(alphabet_size))
+    num_classes = max(1, num_states // 4)
+    # The state q behaves as the state q % num_classes of the smaller DFA
+    base = {q: {symbol: rng.randrange(num_classes) for symbol in alphabet}
+            for q in range(num_classes)}
+    transition = {}
+    for state in range(num_states):
+        transition[state] = {}
+        for symbol in alphabet:
+            target = base[state % num_classes][symbol]
+            copies = (num_states - 1 - target) // num_classes + 1
+            transition[state][symbol] = target + num_classes*rng.randrange(copies)
+    accept_states = {state for state in range(num_states) if state % num_classes % 2}
+    return DFA(range(num_states), alphabet, transition, 0, accept_states)
+
+def random_NFA(num_states, alphabet_size=2, density=1.5, eps_density=0.1,
+               accept_density=0.2, seed=0):
+    """
+    Returns a random NFA with states 0..num_states-1, with on average density
+        successors per state and symbol, eps_density empty string successors
+        per state, and every state accepting with probability accept_density
+    """
+    rng = random.Random(seed)
+    alphabet = symbols_of(alphabet_size)
+    def successors(mean):
+        return {rng.randrange(num_states) for _ in range(num_states)
+                if rng.random() < mean / num_states}
+    transition = {}
+    for state in range(num_states):
+        transition[state] = {symbol: successors(density) for symbol in alphabet}
+        transition[state][''] = successors(eps_density)
+    accept_states = {state for state in range(num_states) if rng.random() < accept_density}
+    return NFA(range(num_states), alphabet, transition, 0, accept_states)
+
+def kth_from_end_NFA(k):
+    """
+    Returns the NFA with k+1 states accepting the binary strings whose k-th
+        symbol from the end is 1, whose minimal DFA has 2^k states
+    """
+    transition = {0: {'0': {0}, '1': {0, 1}, '': set()}}
+    for state in range(1, k):
+        transition[state] = {'0': {state + 1}, '1': {state + 1}, '': set()}
+    transition[k] = {'0': set(), '1': set(), '': set()}
+    return NFA(range(k + 1), {'0', '1'}, transition, 0, {k})
+
+def counter_DFA(m, alphabet_size=2):
+    """
+    Returns the DFA with m states accepting the strings with a number of 0s
+        divisible by m, whose products with other counters stay minimal
+    """
+    alphabet = sorted(symbols_of(alphabet_size))
+    transition = {state: {symbol: (state + 1) % m if symbol == '0' else state
+                          for symbol in alphabet}
+                  for state in range(m)}
+    return DFA(range(m), alphabet, transition, 0, {0})
+
+def random_string(alphabet, length, seed=0):
+    """
+    Returns a random string of a given length over an alphabet
+    """
+    rng = random.Random(seed)
+    return "".join(rng.choices(sorted(alphabet), k=length))
@@ -0,0 +1,28 @@
+"""
+Scaling benchmark of DFA.minimize() on random DFAs from 10 to 100k states
+"""
+
+import time
+
+from benchmarks.generators import redundant_DFA
+
+def bench_minimize(sizes=(10, 100, 1000, 10000, 100000), repeat=3):
+    """
+    Returns a list of (num_states, reachable states, minimal states, seconds) of
+        DFA.minimize(), taking the best of repeat runs
+    """
+    results = []
+    for num_states in sizes:
+        M = redundant_DFA(num_states, seed=num_states)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            minimal = M.minimize()
+            best = min(best, time.perf_counter() - start)
+        results.append((num_states, len(M.strip().states), len(minimal.states), best))
+    return results
+
+if __name__ == "__main__":
+    print(f"{'states':>8} {'reachable':>10} {'minimal':>8} {'seconds':>9}")
+    for num_states, reachable, minimal, seconds in bench_minimize():
+        print(f"{num_states:>8} {reachable:>10} {minimal:>8} {seconds:>9.4f}")
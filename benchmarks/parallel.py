@@ -0,0 +1,67 @@
+"""
+Benchmark of parallel matching of one large input against the sequential
+DFA.accepts(), on DFASamples(1) and DFASamples(8)
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from dfademo import DFASamples
+from finstatemach import accepts_file_parallel, accepts_parallel
+
+def random_input(alphabet, size):
+    """
+    Returns random bytes of a given size over an alphabet of single characters
+    """
+    symbols = sorted(alphabet)
+    table = bytes(ord(symbols[byte % len(symbols)]) for byte in range(256))
+    chunks = []
+    for start in range(0, size, 1 << 20):
+        block = os.urandom(min(1 << 20, size - start))
+        chunks.append(block.translate(table))
+    return b"".join(chunks)
+
+def timed(function, *args, **kwargs):
+    """
+    Returns the result of a function call and the seconds it took
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def bench_parallel(num, megabytes, processes):
+    """
+    Prints the time of the sequential and parallel matchers of DFASamples(num)
+        on a random input of a given size in megabytes
+    """
+    M = DFASamples(num)
+    data = random_input(M.alphabet, megabytes << 20)
+    input_string = data.decode("latin-1")
+    expected, sequential = timed(M.accepts, input_string)
+    print(f"DFASamples({num}), {megabytes} MB")
+    print(f"    {'DFA.accepts':<28} {sequential:>8.2f} s")
+    _, compiled = timed(M.relabel().accepts, input_string)
+    print(f"    {'CompiledDFA.accepts':<28} {compiled:>8.2f} s  x{sequential/compiled:.1f}")
+    with tempfile.NamedTemporaryFile(delete=False) as file:
+        file.write(data)
+    try:
+        for workers in processes:
+            result, seconds = timed(accepts_parallel, M, input_string, workers)
+            assert result == expected
+            print(f"    {f'accepts_parallel({workers})':<28} {seconds:>8.2f} s  x{sequential/seconds:.1f}")
+            result, seconds = timed(accepts_file_parallel, M, file.name, workers)
+            assert result == expected
+            print(f"    {f'accepts_file_parallel({workers})':<28} {seconds:>8.2f} s  x{sequential/seconds:.1f}")
+    finally:
+        os.unlink(file.name)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=int, default=256)
+    parser.add_argument("--processes", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+    for num in (1, 8):
+        bench_parallel(num, args.megabytes, args.processes)
@@ -0,0 +1,148 @@
+"""
+Benchmark suite of the DFA and NFA operations across size sweeps, writing
+machine-readable results for tracking regressions between releases
+"""
+
+import json
+import os
+import platform
+import time
+
+from benchmarks.generators import (counter_DFA, kth_from_end_NFA, random_DFA, random_NFA,
+                                   random_string, redundant_DFA)
+from finstatemach import intersect
+
+"Size sweeps of the full and quick runs"
+SWEEPS = {
+    "full": {
+        "dfa_states": (10, 100, 1000, 10000, 100000),
+        "diagram_states": (10, 100, 1000),
+        "dot_states": (1000, 10000, 50000),
+        "counter_states": (10, 30, 100, 300),
+        "kth_from_end": (4, 6, 8, 10, 12, 14),
+        "nfa_states": (8, 16, 24, 32),
+        "input_length": 100000,
+    },
+    "quick": {
+        "dfa_states": (10, 100, 1000),
+        "diagram_states": (10, 100),
+        "dot_states": (1000,),
+        "counter_states": (10, 30),
+        "kth_from_end": (4, 6, 8),
+        "nfa_states": (8, 16),
+        "input_length": 10000,
+    },
+}
+
+def best_time(function, repeat):
+    """
+    Returns the result of a function and the best of repeat timings in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def record(benchmark, params, states, seconds, repeat):
+    """
+    Returns a result record
+    """
+    return {"benchmark": benchmark, "params": params, "states": states,
+            "seconds": seconds, "repeat": repeat}
+
+def bench_accepts(sweep, repeat):
+    """
+    Yields the records of DFA.accepts() and CompiledDFA.accepts() on random DFAs
+    """
+    for num_states in sweep["dfa_states"]:
+        M = random_DFA(num_states, seed=num_states)
+        C = M.relabel()
+        input_string = random_string(M.alphabet, sweep["input_length"], seed=num_states)
+        params = {"num_states": num_states, "length": len(input_string)}
+        _, seconds = best_time(lambda: M.accepts(input_string), repeat)
+        yield record("DFA.accepts", params, num_states, seconds, repeat)
+        _, seconds = best_time(lambda: C.accepts(input_string), repeat)
+        yield record("CompiledDFA.accepts", params, num_states, seconds, repeat)
+
+def bench_to_DFA(sweep, repeat):
+    """
+    Yields the records of NFA.to_DFA() on the k-th symbol from the end NFAs and on
+        random NFAs
+    """
+    for k in sweep["kth_from_end"]:
+        N = kth_from_end_NFA(k)
+        M, seconds = best_time(N.to_DFA, repeat)
+        yield record("NFA.to_DFA/kth_from_end", {"k": k}, len(M.states), seconds, repeat)
+    for num_states in sweep["nfa_states"]:
+        N = random_NFA(num_states, seed=num_states)
+        M, seconds = best_time(N.to_DFA, repeat)
+        yield record("NFA.to_DFA/random", {"num_states": num_states, "density": 1.5,
+                     "eps_density": 0.1}, len(M.states), seconds, repeat)
+
+def bench_minimize(sweep, repeat):
+    """
+    Yields the records of DFA.strip() and DFA.minimize() on random DFAs with
+        equivalent states
+    """
+    for num_states in sweep["dfa_states"]:
+        M = redundant_DFA(num_states, seed=num_states)
+        params = {"num_states": num_states}
+        stripped, seconds = best_time(M.strip, repeat)
+        yield record("DFA.strip", params, len(stripped.states), seconds, repeat)
+        minimal, seconds = best_time(M.minimize, repeat)
+        yield record("DFA.minimize", params, len(minimal.states), seconds, repeat)
+
+def bench_products(sweep, repeat):
+    """
+    Yields the records of the product operators on counter DFAs
+    """
+    for m in sweep["counter_states"]:
+        A, B, C = counter_DFA(m), counter_DFA(m + 1), counter_DFA(m + 2)
+        params = {"m": m}
+        for name, operation in (("DFA.__and__", lambda: A & B), ("DFA.__or__", lambda: A | B),
+                                ("DFA.__sub__", lambda: A - B)):
+            M, seconds = best_time(operation, repeat)
+            yield record(name, params, len(M.states), seconds, repeat)
+        if m <= 100:
+            M, seconds = best_time(lambda: intersect(A, B, C), repeat)
+            yield record("intersect/3", params, len(M.states), seconds, repeat)
+
+def bench_state_diagram(sweep, repeat):
+    """
+    Yields the records of DFA.state_diagram() on random DFAs, without rendering
+    """
+    for num_states in sweep["diagram_states"]:
+        M = random_DFA(num_states, seed=num_states)
+        _, seconds = best_time(M.state_diagram, repeat)
+        yield record("DFA.state_diagram", {"num_states": num_states}, num_states, seconds, repeat)
+
+def bench_to_dot(sweep, repeat):
+    """
+    Yields the records of DFA.to_dot() on random DFAs, written to the null device
+    """
+    for num_states in sweep["dot_states"]:
+        M = random_DFA(num_states, seed=num_states)
+        _, seconds = best_time(lambda: M.to_dot(os.devnull), repeat)
+        yield record("DFA.to_dot", {"num_states": num_states}, num_states, seconds, repeat)
+
+BENCHMARKS = [bench_accepts, bench_to_DFA, bench_minimize, bench_products, bench_state_diagram,
+              bench_to_dot]
+
+def run_suite(quick=False, repeat=3, verbose=True):
+    """
+    Returns the results of all the benchmarks with their metadata
+    """
+    sweep = SWEEPS["quick" if quick else "full"]
+    results = []
+    for benchmark in BENCHMARKS:
+        for result in benchmark(sweep, repeat):
+            if verbose:
+                print(f"{result['benchmark']:<28} {json.dumps(result['params']):<42}"
+                      f" {result['states']:>8} {result['seconds']:>10.5f} s", flush=True)
+            results.append(result)
+    metadata = {"python": platform.python_version(), "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "sweep": "quick" if quick else "full", "repeat": repeat}
+    return {"metadata": metadata, "results": results}
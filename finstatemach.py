@@ -2,8 +2,27 @@
 Module for Finite State Machines
 """
 
+import codecs
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from graphviz import Digraph
 from itertools import chain, combinations
+from types import MappingProxyType
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Preliminaries
 class _frozenset(frozenset):
@@ -30,6 +49,117 @@ class equivalence_class(_frozenset):
     def __repr__(self):
         return equivalence_class_repr(_frozenset(self).__repr__())
 
+# Instrumentation
+class Stats():
+    """
+    Class for the counters and timers collected by collect_stats()
+    
+    Attributes
+    ----------
+        counters : dict
+            counters[name] is the total of a counter
+        timers : dict
+            timers[name] is the list [number of calls, total seconds] of an operation
+    """
+    def __init__(self):
+        "Class initialization"
+        self.counters = {}
+        self.timers = {}
+    
+    def __repr__(self):
+        "Class representation"
+        return "Stats at " + f"{hex(id(self))}"
+    
+    def __str__(self):
+        "String representation"
+        string = "Timers: operation -> calls, seconds"
+        for name, (calls, seconds) in sorted(self.timers.items()):
+            string += "\n\t" + f"{name:<32} {calls:>10} {seconds:>12.6f}"
+        string += "\nCounters: counter -> total"
+        for name, total in sorted(self.counters.items()):
+            string += "\n\t" + f"{name:<32} {total:>10}"
+        return string
+    
+    def count(self, name, amount=1):
+        """
+        Adds amount to a counter
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def add_time(self, name, seconds):
+        """
+        Adds a call taking seconds to a timer
+        """
+        timer = self.timers.setdefault(name, [0, 0.0])
+        timer[0] += 1
+        timer[1] += seconds
+    
+    def merge(self, other):
+        """
+        Adds the counters and timers of other Stats
+        """
+        for name, total in other.counters.items():
+            self.count(name, total)
+        for name, (calls, seconds) in other.timers.items():
+            timer = self.timers.setdefault(name, [0, 0.0])
+            timer[0] += calls
+            timer[1] += seconds
+
+"Stats being collected, None when the instrumentation is off"
+_stats = None
+
+@contextmanager
+def collect_stats():
+    """
+    Context manager turning the instrumentation on, which yields the Stats
+        collected inside it, also added to those of an enclosing collect_stats()
+    """
+    global _stats
+    previous, stats = _stats, Stats()
+    _stats = stats
+    try:
+        yield stats
+    finally:
+        _stats = previous
+        if previous is not None:
+            previous.merge(stats)
+
+def instrumented(name):
+    """
+    Returns a decorator timing the calls of a function under name while
+        collect_stats() is active, costing one global lookup otherwise
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _stats is None:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                if _stats is not None:
+                    _stats.add_time(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def deep_sizeof(obj, seen=None):
+    """
+    Returns an estimate in bytes of the memory used by an object and the
+        dicts, sets, lists and tuples it contains, counting each object once
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (set, frozenset, list, tuple)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
 def set_product(A, B):
     """
     Returns the Cartesian Product of two sets
@@ -72,25 +202,609 @@ def equivalence_class_repr(string):
     """
     return string.replace("{", "[", 1).replace("}", "]", 1)
 
+def sorted_symbols(alphabet):
+    """
+    Returns the symbols of an alphabet in a deterministic order
+    """
+    try:
+        return sorted(alphabet)
+    except TypeError:
+        return sorted(alphabet, key=repr)
+
 def get_keys_from_value(dict, value):
     """
     Returns a list of keys that has the corresponding value 'value'
     """
     return [key for key, val in dict.items() if val == value]
 
+def edge_label(symbols, ranges=False):
+    """
+    Returns the label of an edge reading symbols, sorted and separated by
+        commas, with the empty string as the symbol eps. If ranges is True,
+        runs of at least three consecutive characters are written as "a-z"
+    """
+    symbols = sorted_symbols(symbols)
+    parts = []
+    idx = 0
+    while idx < len(symbols):
+        symbol = symbols[idx]
+        end = idx
+        if ranges and isinstance(symbol, str) and len(symbol) == 1:
+            while (end + 1 < len(symbols) and isinstance(symbols[end + 1], str)
+                   and len(symbols[end + 1]) == 1 and ord(symbols[end + 1]) == ord(symbols[end]) + 1):
+                end += 1
+        if end - idx >= 2:
+            parts.append(f"{symbol}-{symbols[end]}")
+        else:
+            end = idx
+            parts.append(eps if symbol == '' else str(symbol))
+        idx = end + 1
+    return ",".join(parts)
+
+def dot_quote(string):
+    """
+    Returns a string as a quoted DOT identifier
+    """
+    return '"' + str(string).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+def write_dot(M, file, collapse=True, max_states=None, around=None, radius=1):
+    """
+    Writes the state diagram of a DFA or NFA in the DOT language to a path or
+        a text file, one line at a time without building the graph in memory
+        nor needing graphviz, with the states numbered breadth-first from the
+        start state
+    
+    Attributes
+    ----------
+        collapse : bool
+            if True, the parallel edges between two states are written as one
+            edge whose label joins their symbols, with runs of characters as
+            ranges, otherwise one edge is written for each symbol
+        max_states : int
+            if given, only the first max_states states are written and the
+            edges to the other states go to a single node counting them
+        around : iterable
+            if given, only the states at most radius transitions away from
+            these states, forwards or backwards, are written
+        radius : int
+            the radius of the neighbourhood of the states around
+    """
+    # rows[state] is the list of the grouped edges from state, built on first use
+    rows = {}
+    def row(state):
+        if state not in rows:
+            rows[state] = list(M.edges([state]))
+        return rows[state]
+    if around is not None:
+        predecessors = {}
+        for state, next_state, _ in M.edges():
+            predecessors.setdefault(next_state, set()).add(state)
+        selected = set(around)
+        NewStates = set(selected)
+        for _ in range(radius):
+            TempStates = set()
+            for state in NewStates:
+                TempStates.update(next_state for _, next_state, _ in row(state))
+                TempStates.update(predecessors.get(state, ()))
+            NewStates = TempStates - selected
+            selected |= NewStates
+    else:
+        selected = M.states
+    # Number the selected states breadth-first from the start state, stopping
+    #   after max_states of them
+    limit = len(selected) if max_states is None else max_states
+    order = []
+    state_index = {}
+    for root in chain([M.start_state], selected):
+        if len(order) >= limit:
+            break
+        if root in state_index or root not in selected:
+            continue
+        state_index[root] = len(order)
+        order.append(root)
+        idx = len(order) - 1
+        while idx < len(order) and len(order) < limit:
+            for _, next_state, _ in row(order[idx]):
+                if next_state not in state_index and next_state in selected:
+                    state_index[next_state] = len(order)
+                    order.append(next_state)
+                    if len(order) >= limit:
+                        break
+            idx += 1
+    hidden = len(selected) - len(order)
+    opened = isinstance(file, (str, bytes, os.PathLike))
+    if opened:
+        file = open(file, "w", encoding="utf-8")
+    try:
+        write = file.write
+        write("digraph {\n")
+        write(f"\trankdir=LR label={dot_quote(repr(M))} labelloc=t fontsize=11\n")
+        write('\tnode [shape=circle fontname="Helvetica,Arial,sans-serif" fontsize=9]\n')
+        write('\tedge [arrowhead=vee arrowsize=0.25 fontname="Helvetica,Arial,sans-serif" fontsize=9]\n')
+        if M.start_state in state_index:
+            write("\tentry [label=\"\" shape=none]\n")
+            write(f"\tentry -> s{state_index[M.start_state]}\n")
+        for idx, state in enumerate(order):
+            label = phi if state == set() else delete_apostrophe(str(state))
+            shape = " shape=doublecircle" if state in M.accept_states else ""
+            write(f"\ts{idx} [label={dot_quote(label)}{shape}]\n")
+        if hidden:
+            write(f"\tmore [label={dot_quote(f'{hidden} more states')} shape=box style=dashed]\n")
+        # hidden_symbols[source] is the set of symbols of the edges to hidden states
+        hidden_symbols = {}
+        # labels[symbols] is the quoted label of the edges reading symbols
+        labels = {}
+        lines = []
+        for state in order:
+            source = f"s{state_index[state]}"
+            for _, next_state, symbols in row(state):
+                if next_state not in state_index:
+                    if hidden and next_state in selected:
+                        hidden_symbols.setdefault(source, set()).update(symbols)
+                    continue
+                target = f"s{state_index[next_state]}"
+                split = [symbols] if collapse else [[symbol] for symbol in sorted_symbols(symbols)]
+                for symbols in split:
+                    key = tuple(symbols)
+                    label = labels.get(key)
+                    if label is None:
+                        label = labels[key] = dot_quote(edge_label(symbols, True))
+                    lines.append(f"\t{source} -> {target} [label={label}]\n")
+            if len(lines) >= 4096:
+                write("".join(lines))
+                lines.clear()
+        write("".join(lines))
+        for source, symbols in hidden_symbols.items():
+            write(f"\t{source} -> more [label={dot_quote(edge_label(symbols, True))} style=dashed]\n")
+        write("}\n")
+    finally:
+        if opened:
+            file.close()
+
+def iter_bits(mask):
+    """
+    Yields the positions of the set bits of an integer bitmask in increasing order
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def hopcroft(table, k, labels):
+    """
+    Returns the coarsest partition of the states of a complete DFA that refines
+        the partition by labels and is compatible with the transitions, as a
+        list whose i-th entry is the block number of the state i
+    
+    Attributes
+    ----------
+        table : sequence
+            flat transition table of the form table[state*k + symbol] = state
+        k : int
+            the number of symbols
+        labels : sequence
+            labels[i] is the initial label of the state i, for example 1 for the
+            accepting states and 0 for the others
+    """
+    n = len(labels)
+    # Inverse transitions of the form inverse[symbol][state] = [states]
+    inverse = [[[] for _ in range(n)] for _ in range(k)]
+    for state in range(n):
+        for symbol in range(k):
+            inverse[symbol][table[state*k + symbol]].append(state)
+    block_index = {}
+    block_of = [block_index.setdefault(label, len(block_index)) for label in labels]
+    blocks = [[] for _ in block_index]
+    for state, block in enumerate(block_of):
+        blocks[block].append(state)
+    blocks = [set(block) for block in blocks]
+    # Refining by all blocks but the largest one also refines by the largest one
+    largest = max(range(len(blocks)), key=lambda block: len(blocks[block]), default=0)
+    waiting = set(range(len(blocks))) - {largest}
+    num_splitters = 0
+    while waiting:
+        num_splitters += 1
+        splitter = list(blocks[waiting.pop()])
+        for symbol in range(k):
+            symbol_inverse = inverse[symbol]
+            touched = {}
+            for state in splitter:
+                for other_state in symbol_inverse[state]:
+                    touched.setdefault(block_of[other_state], []).append(other_state)
+            for block, states in touched.items():
+                if len(states) == len(blocks[block]):
+                    continue
+                new_block = len(blocks)
+                blocks[block].difference_update(states)
+                blocks.append(set(states))
+                for state in states:
+                    block_of[state] = new_block
+                if block in waiting or len(states) < len(blocks[block]):
+                    waiting.add(new_block)
+                else:
+                    waiting.add(block)
+    if _stats is not None:
+        _stats.count("hopcroft.splitters", num_splitters)
+        _stats.count("hopcroft.blocks", len(blocks))
+    return block_of
+
+def symbol_classes(table, k):
+    """
+    Returns the list whose i-th entry is the class of the symbol i of a flat
+        transition table with k symbols, where two symbols are in the same class
+        if they move every state to the same state, numbered in order of their
+        first symbol, and the flat transition table of the classes
+    """
+    table = array('i', table)
+    columns = {}
+    classes = [columns.setdefault(table[column::k].tobytes(), len(columns))
+               for column in range(k)]
+    m = len(columns)
+    if m == k:
+        return classes, table
+    compressed = array('i', bytes(4*(len(table)//k)*m))
+    representatives = {}
+    for column, symbol_class in enumerate(classes):
+        if symbol_class not in representatives:
+            representatives[symbol_class] = column
+            compressed[symbol_class::m] = table[column::k]
+    return classes, compressed
+
 "Empty string representation"
 eps = "\u03B5"
 "Empty set representation"
 phi = "\u03A6"
 
-def parse_expression(string):
+"Bytes-like input types, whose byte b is read as the symbol chr(b)"
+bytes_types = (bytes, bytearray, memoryview)
+"Symbols of the byte values, byte_symbols[b] is chr(b)"
+byte_symbols = tuple(map(chr, range(256)))
+"Largest number of states of a compiled NFA stepping through byte tables"
+byte_table_states = 128
+
+"Operators of regular expressions"
+union_ops = {"|", "\u222A"}
+star_ops = {"*"}
+plus_ops = {"+"}
+
+def parse_expression(string, alphabet=None):
+    """
+    Returns the parse tree of a regular expression as nested tuples
+    
+    The expression is built from the symbols of the alphabet, eps for the empty
+        string, phi for the empty set, union with | or \u222A, concatenation by
+        juxtaposition, star with *, R+ for RR*, and parentheses. Characters of
+        the alphabet are always read as symbols, and whitespace outside the
+        alphabet is ignored. The tree nodes are ('symbol', a), ('epsilon',),
+        ('empty',), ('union', R1, R2, ...), ('concat', R1, R2, ...) and ('star', R).
+    """
+    if alphabet is None:
+        alphabet = set(string) - union_ops - star_ops - plus_ops - {"(", ")", eps, phi} \
+            - {char for char in string if char.isspace()}
+    tokens = [char for char in string if char in alphabet or not char.isspace()]
+    position = 0
+    
+    def error(message):
+        return ValueError(f"{message} at position {position} of RegEx {string!r}")
+    
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+    
+    def parse_union():
+        nonlocal position
+        terms = [parse_concat()]
+        while peek() is not None and peek() in union_ops and peek() not in alphabet:
+            position += 1
+            terms.append(parse_concat())
+        return terms[0] if len(terms) == 1 else ("union",) + tuple(terms)
+    
+    def parse_concat():
+        factors = []
+        while peek() is not None and (peek() in alphabet or peek() not in union_ops | {")"}):
+            factors.append(parse_repeat())
+        if not factors:
+            return ("epsilon",)
+        return factors[0] if len(factors) == 1 else ("concat",) + tuple(factors)
+    
+    def parse_repeat():
+        nonlocal position
+        tree = parse_atom()
+        while peek() is not None and peek() not in alphabet and peek() in star_ops | plus_ops:
+            if peek() in star_ops:
+                tree = ("star", tree)
+            else:
+                tree = ("concat", tree, ("star", tree))
+            position += 1
+        return tree
+    
+    def parse_atom():
+        nonlocal position
+        token = peek()
+        position += 1
+        if token in alphabet:
+            return ("symbol", token)
+        if token == eps:
+            return ("epsilon",)
+        if token == phi:
+            return ("empty",)
+        if token == "(":
+            tree = parse_union()
+            if peek() != ")":
+                raise error("Expected )")
+            position += 1
+            return tree
+        position -= 1
+        raise error(f"Unexpected {token!r}")
+    
+    tree = parse_union()
+    if position < len(tokens):
+        raise error(f"Unexpected {tokens[position]!r}")
+    return tree
+
+"Order of the kinds of terms of a union, as in regex_order()"
+regex_ranks = {"epsilon": 0, "symbol": 1, "star": 2, "concat": 3}
+
+def regex_order(tree):
+    """
+    Returns the sort key of a parse tree in a union: the empty string first,
+        then symbols, stars and concatenations, each kind in tree order
+    """
+    return (regex_ranks.get(tree[0], len(regex_ranks)), tree)
+
+def regex_union(*terms):
+    """
+    Returns the simplified union of parse trees of regular expressions, as in
+        parse_expression(), flattening nested unions, removing the empty set
+        and duplicates, absorbing eps into a star, and factoring a first or
+        last factor common to all the terms. The terms are sorted by
+        regex_order(), so that equal unions are equal trees
+    """
+    flat = []
+    for term in terms:
+        for item in (term[1:] if term[0] == "union" else (term,)):
+            if item[0] != "empty" and item not in flat:
+                flat.append(item)
+    flat.sort(key=regex_order)
+    if ("epsilon",) in flat and len(flat) > 1:
+        for idx, item in enumerate(flat):
+            if item[0] == "star":
+                break
+            if item[0] == "concat" and len(item) == 3 and item[2] == ("star", item[1]):
+                flat[idx] = item[2]
+                break
+        else:
+            idx = None
+        if idx is not None:
+            flat.remove(("epsilon",))
+    if not flat:
+        return ("empty",)
+    if len(flat) == 1:
+        return flat[0]
+    factors = [item[1:] if item[0] == "concat" else (item,) for item in flat]
+    if all(len(item) > 1 for item in factors):
+        if all(item[0] == factors[0][0] for item in factors):
+            return regex_concat(factors[0][0], regex_union(*(regex_concat(*item[1:])
+                                                             for item in factors)))
+        if all(item[-1] == factors[0][-1] for item in factors):
+            return regex_concat(regex_union(*(regex_concat(*item[:-1]) for item in factors)),
+                                factors[0][-1])
+    return ("union",) + tuple(flat)
+
+def regex_concat(*terms):
+    """
+    Returns the simplified concatenation of parse trees of regular expressions,
+        flattening nested concatenations, removing eps, merging R*R* into R*,
+        and the empty set if a term is the empty set
+    """
+    flat = []
+    for term in terms:
+        for item in (term[1:] if term[0] == "concat" else (term,)):
+            if item[0] == "empty":
+                return ("empty",)
+            if item[0] == "epsilon" or (item[0] == "star" and flat and flat[-1] == item):
+                continue
+            flat.append(item)
+    if not flat:
+        return ("epsilon",)
+    return flat[0] if len(flat) == 1 else ("concat",) + tuple(flat)
+
+def regex_star(term):
+    """
+    Returns the simplified star of a parse tree of a regular expression, with
+        eps and the empty set starred to eps, R** to R* and (eps|R)* to R*
+    """
+    if term[0] in ("empty", "epsilon"):
+        return ("epsilon",)
+    if term[0] == "star":
+        return term
+    if term[0] == "union" and ("epsilon",) in term[1:]:
+        return regex_star(regex_union(*(item for item in term[1:] if item != ("epsilon",))))
+    if term[0] == "concat" and len(term) == 3 and term[2] == ("star", term[1]):
+        return term[2]
+    return ("star", term)
+
+def regex_string(tree):
+    """
+    Returns the regular expression of a parse tree, as read by
+        parse_expression(), with | for union and RR* written as R+
+    """
+    kind = tree[0]
+    if kind == "symbol":
+        return str(tree[1])
+    if kind == "epsilon":
+        return eps
+    if kind == "empty":
+        return phi
+    if kind == "union":
+        return "|".join(regex_string(item) for item in tree[1:])
+    if kind == "star":
+        item = regex_string(tree[1])
+        return (item if tree[1][0] == "symbol" else f"({item})") + "*"
+    factors = list(tree[1:])
+    string = ""
+    idx = 0
+    while idx < len(factors):
+        item = factors[idx]
+        plus = idx + 1 < len(factors) and factors[idx + 1] == ("star", item)
+        item_string = regex_string(item)
+        if item[0] == "union" or (plus and item[0] != "symbol"):
+            item_string = f"({item_string})"
+        string += item_string + ("+" if plus else "")
+        idx += 2 if plus else 1
+    return string
+
+def regex_size(tree, sizes=None):
+    """
+    Returns the number of nodes of a parse tree of a regular expression,
+        reusing the dict sizes of the sizes of shared subtrees if given
+    """
+    if sizes is None:
+        sizes = {}
+    key = id(tree)
+    if key not in sizes:
+        sizes[key] = (tree, 1 + sum(regex_size(item, sizes) for item in tree[1:]
+                                    if isinstance(item, tuple)))
+    return sizes[key][1]
+
+"Binary format of compiled automata"
+FORMAT_MAGIC = b"FSMA"
+FORMAT_VERSION = 2
+FORMAT_KINDS = {"DFA": 0, "NFA": 1}
+# magic, version, kind, number of states, number of symbols, start state,
+#   bytes of the symbol table, bytes of the label table, entries of the transition array
+#   Version 2 adds the symbol class array after the symbol table
+FORMAT_HEADER = struct.Struct("<4sHH6Q")
+
+def encode_label(label):
+    """
+    Returns a JSON-compatible encoding of a state or symbol, with tuples,
+        frozensets and equivalence classes as lists tagged "t", "f" and "e"
+    """
+    if isinstance(label, tuple):
+        return ["t"] + [encode_label(item) for item in label]
+    if isinstance(label, equivalence_class):
+        return ["e"] + [encode_label(item) for item in label]
+    if isinstance(label, frozenset):
+        return ["f"] + [encode_label(item) for item in label]
+    return label
+
+def decode_label(label):
+    """
+    Returns the state or symbol of an encoding by encode_label()
+    """
+    if isinstance(label, list):
+        items = [decode_label(item) for item in label[1:]]
+        return {"t": tuple, "e": equivalence_class, "f": _frozenset}[label[0]](items)
+    return label
+
+class LazyLabels():
+    """
+    Class for a label table that is decoded from JSON the first time it is used
+    
+    Attributes
+    ----------
+        data : bytes-like
+            the JSON encoding of the list of labels by encode_label()
+    """
+    def __init__(self, data):
+        "Class initialization"
+        self.data = data
+        self._labels = None
+    
+    def _decoded(self):
+        """
+        Returns the list of labels, decoding it on first use
+        """
+        if self._labels is None:
+            self._labels = [decode_label(label) for label in json.loads(bytes(self.data))]
+            self.data = None
+        return self._labels
+    
+    def __getitem__(self, idx):
+        "Returns the label of the state numbered idx"
+        return self._decoded()[idx]
+    
+    def __len__(self):
+        "Returns the number of labels"
+        return len(self._decoded())
+    
+    def __iter__(self):
+        "Iterates over the labels"
+        return iter(self._decoded())
+
+def _padding(size):
     """
-    Returns the parsed expression of a string in a list
+    Returns the zero bytes that align a section of a given size to 8 bytes
     """
-    n = len(string)
-    partition = []
-    for i in range(n):
-        pass
+    return bytes(-size % 8)
+
+def write_automaton(path, kind, start_state, symbols, accept, table, labels, classes=None):
+    """
+    Writes an automaton with states 0..n-1 to a file in the binary format:
+        a header, the symbol table, the symbol class array, the accept bitmap,
+        the transition array and the state label table, each section aligned
+        to 8 bytes, the arrays being of little-endian 32-bit integers. The
+        class of each symbol defaults to its number
+    """
+    n = len(accept)
+    classes = array('i', range(len(symbols)) if classes is None else classes)
+    symbols_data = json.dumps([encode_label(symbol) for symbol in symbols]).encode()
+    labels_data = json.dumps([encode_label(label) for label in labels]).encode()
+    bitmap = bytearray(-(-n // 8))
+    for state in range(n):
+        if accept[state]:
+            bitmap[state >> 3] |= 1 << (state & 7)
+    table = array('i', table)
+    if sys.byteorder != "little":
+        table.byteswap()
+        classes.byteswap()
+    with open(path, "wb") as file:
+        file.write(FORMAT_HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION, FORMAT_KINDS[kind], n,
+                                      len(symbols), start_state, len(symbols_data),
+                                      len(labels_data), len(table)))
+        for section in (symbols_data, classes.tobytes(), bitmap, table.tobytes(), labels_data):
+            file.write(section)
+            file.write(_padding(len(section)))
+
+def read_automaton(path, kind, use_mmap=True):
+    """
+    Returns the start state, symbols, accept bytearray, transition array,
+        lazily decoded labels and symbol classes of an automaton written by
+        write_automaton(), reading also version 1 files, without classes.
+        If use_mmap is True, the transition array is a memoryview of a memory
+        map of the file, shared with other processes through the page cache
+    """
+    with open(path, "rb") as file:
+        if use_mmap:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = file.read()
+    view = memoryview(data)
+    magic, version, file_kind, n, k, start_state, symbols_size, labels_size, table_size = \
+        FORMAT_HEADER.unpack_from(view)
+    if magic != FORMAT_MAGIC or version not in (1, FORMAT_VERSION) or file_kind != FORMAT_KINDS[kind]:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} {kind} file")
+    offset = FORMAT_HEADER.size
+    sections = []
+    for size in (symbols_size, 4*k if version > 1 else 0, -(-n // 8), 4*table_size, labels_size):
+        sections.append(view[offset:offset + size])
+        offset += size + len(_padding(size))
+    symbols_data, classes_data, bitmap, table_data, labels_data = sections
+    symbols = [decode_label(symbol) for symbol in json.loads(bytes(symbols_data))]
+    classes = array('i', bytes(classes_data)) if version > 1 else array('i', range(k))
+    if np is not None:
+        accept = bytearray(np.unpackbits(np.frombuffer(bitmap, dtype=np.uint8),
+                                         count=n, bitorder="little"))
+    else:
+        accept = bytearray((bitmap[state >> 3] >> (state & 7)) & 1 for state in range(n))
+    table = table_data.cast("i")
+    if sys.byteorder != "little":
+        table = array('i', table)
+        table.byteswap()
+        if version > 1:
+            classes.byteswap()
+    return start_state, symbols, accept, table, LazyLabels(labels_data), list(classes)
+
 
 class DFA():
     """
@@ -176,50 +890,191 @@ class DFA():
             graph.node(str(state), state_str, fixedsize="False", shape="doublecircle",
                        fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
         graph.edge("entry", str(self.start_state), arrowhead="vee", arrowsize="0.25")
-        for state in self.states:
-            for other_state in self.states:
-                label = ",".join(get_keys_from_value(self.transition[state], other_state))
-                if label:
-                    graph.edge(str(state), str(other_state), label, arrowhead="vee", arrowsize="0.25",
-                           fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
+        for state, other_state, symbols in self.edges():
+            graph.edge(str(state), str(other_state), edge_label(symbols), arrowhead="vee",
+                       arrowsize="0.25", fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
         return graph
     
+    def edges(self, states=None):
+        """
+        Yields the triples (state, next state, symbols) of the transitions of
+            the DFA from states, default as all the states, grouped by pair of
+            states, inverting each row once
+        """
+        for state in self.states if states is None else states:
+            targets = {}
+            for symbol, next_state in self.transition[state].items():
+                targets.setdefault(next_state, []).append(symbol)
+            for next_state, symbols in targets.items():
+                yield state, next_state, symbols
+    
+    def to_dot(self, file, collapse=True, max_states=None, around=None, radius=1):
+        """
+        Writes the state diagram of the DFA in the DOT language to a path or a
+            text file, as in write_dot()
+        """
+        write_dot(self, file, collapse, max_states, around, radius)
+    
+    @instrumented("DFA.relabel")
     def relabel(self):
         """
         Returns the relabeled states of DFA in natural numbers 
-            starting at 0
+            starting at 0, compiled to a CompiledDFA whose transition table
+            has a column for each class of symbols, as in symbol_classes()
+        """
+        symbols = sorted_symbols(self.alphabet)
+        # Number the states breadth-first so that the start state is 0
+        labels = []
+        state_index = {}
+        idx = 0
+        for state in chain([self.start_state], self.states):
+            if state in state_index:
+                continue
+            state_index[state] = len(labels)
+            labels.append(state)
+            while idx < len(labels):
+                state_transitions = self.transition[labels[idx]]
+                for symbol in symbols:
+                    next_state = state_transitions[symbol]
+                    if next_state not in state_index:
+                        state_index[next_state] = len(labels)
+                        labels.append(next_state)
+                idx += 1
+        table = array('i')
+        for state in labels:
+            state_transitions = self.transition[state]
+            table.extend(state_index[state_transitions[symbol]] for symbol in symbols)
+        accept = bytearray(len(labels))
+        for state in self.accept_states:
+            if state in state_index:
+                accept[state_index[state]] = 1
+        classes, table = symbol_classes(table, len(symbols))
+        return CompiledDFA(table, symbols, 0, accept, labels, classes)
+    
+    def save(self, path):
+        """
+        Writes the DFA to a file in binary format, compiled by DFA.relabel()
+        """
+        self.relabel().save(path)
+    
+    @staticmethod
+    def load(path, use_mmap=True, compiled=False):
+        """
+        Returns the DFA of a file written by DFA.save(), or its CompiledDFA with
+            the memory-mapped transition table if compiled is True
+        """
+        M = CompiledDFA.load(path, use_mmap)
+        return M if compiled else M.to_DFA()
+    
+    def stats(self):
+        """
+        Returns the statistics of DFA as a dict: the numbers of states, symbols,
+            accept states, reachable states, transitions and distinct edges, the
+            density of edges among the pairs of states, the number of symbol
+            classes, and the estimated memory in bytes of the DFA and of the
+            compiled table of DFA.relabel(), with a column per symbol class
         """
+        n, k = len(self.states), len(self.alphabet)
+        C = self.relabel()
+        edges = {(state, next_state) for state in self.states
+                 for next_state in self.transition[state].values()}
+        return {
+            "States": n,
+            "Symbols": k,
+            "Accept States": len(self.accept_states),
+            "Reachable States": len(self.strip().states),
+            "Transitions": sum(len(self.transition[state]) for state in self.states),
+            "Edges": len(edges),
+            "Density": len(edges) / n**2 if n else 0.0,
+            "Memory": deep_sizeof(self.states) + deep_sizeof(self.transition)
+                      + deep_sizeof(self.accept_states),
+            "Symbol Classes": C.width,
+            "Compiled Memory": 4*len(C)*C.width + len(C) + 4*len(C.classes),
+        }
     
     def print_stats(self):
         """
         Prints the statistics of DFA
         """
-                       
+        string = self.__repr__()
+        for name, value in self.stats().items():
+            string += "\n" + f"{name:<17}: " + (f"{value:.4g}" if isinstance(value, float) else f"{value}")
+        print(string)
+    
     def accepts(self, input_string=""):
         """
         Returns True if the DFA accepts the DFA accepts the input string,
-            default as the empty string, otherwise False
+            default as the empty string, otherwise False. The input string
+            may be bytes-like, its byte b being read as the symbol chr(b).
+            Timed in the body rather than by instrumented(), which would slow
+            down the calls on short strings when the instrumentation is off
         """
+        stats = _stats
+        if stats is not None:
+            stats.count("DFA.accepts.symbols", len(input_string))
+            start = time.perf_counter()
+        if isinstance(input_string, bytes_types):
+            # Blocks of 64 KiB are decoded to shared one-character strings, never the whole input
+            data = memoryview(input_string).cast('B')
+            input_string = chain.from_iterable(str(data[start:start + (1 << 16)], "latin-1")
+                                               for start in range(0, len(data), 1 << 16))
         current_state = self.start_state
-        for idx in range(len(input_string)):
-            current_symbol = input_string[idx]
-            current_state = self.transition[current_state][current_symbol]
+        transition = self.transition
+        for current_symbol in input_string:
+            current_state = transition[current_state][current_symbol]
+        if stats is not None:
+            stats.add_time("DFA.accepts", time.perf_counter() - start)
         if current_state in self.accept_states:
             return True
         else: 
             return False
+    
+    def accepts_many(self, strings, batch_size=65536):
+        """
+        Returns a NumPy boolean array whose i-th entry is True if the DFA
+            accepts the i-th input string, evaluated as a batch on the compiled DFA
+        """
+        return self.relabel().accepts_many(strings, batch_size)
 
+    def finditer(self, text, longest=True):
+        """
+        Yields the (start, end) spans of the non-overlapping substrings of text
+            accepted by the DFA, leftmost-longest, or leftmost-shortest if
+            longest is False. See Searcher to reuse the scanning automata
+        """
+        return Searcher(self, longest).finditer(text)
+    
+    def search(self, text, longest=True):
+        """
+        Returns the (start, end) span of the first substring of text accepted
+            by the DFA, as in DFA.finditer(), or None if there is none
+        """
+        return Searcher(self, longest).search(text)
+    
     def transition_ext(self, alphabet=set()):
         """
         Returns the extension of transition of a DFA to larger alphabet
         """
-        transition = self.transition.copy()
+        transition = {}
         for state in self.states:
-            state_transitions = transition[state]
+            state_transitions = dict(self.transition[state])
             for symbol in alphabet - self.alphabet:
                 state_transitions.update({symbol: state})
+            transition[state] = state_transitions
         return transition
     
+    def freeze(self):
+        """
+        Returns the frozen DFA of the DFA, as in freeze()
+        """
+        return freeze(self)
+    
+    def to_RegEx(self):
+        """
+        Converts DFA to RegEx by state elimination, as in GNFA.to_tree()
+        """
+        return GNFA.from_DFA(self).to_RegEx()
+    
     def to_NFA(self):
         """
         Converts DFA to NFA
@@ -233,6 +1088,13 @@ class DFA():
                 state_transitions.update({symbol : {self.transition[state][symbol]}})
         return NFA(self.states, self.alphabet, transition, self.start_state, self.accept_states)
     
+    def reverse(self):
+        """
+        Returns the NFA accepting the reverses of the strings accepted by the DFA,
+            as in NFA.reverse()
+        """
+        return self.to_NFA().reverse()
+    
     # Regular Operations of DFAs
     def __neg__(self):
         """
@@ -245,47 +1107,123 @@ class DFA():
         """
         Returns the intersection of two DFAs
         """
-        states = set_product(self.states, other.states)
-        alphabet = self.alphabet & other.alphabet
-        transition = {}
-        for state in states:
-            transition[state] = {}
-            state_transitions = transition[state]
-            for symbol in alphabet:
-                state_transitions.update({symbol : (self.transition[state[0]][symbol],
-                                                    other.transition[state[1]][symbol])})
-        start_state = (self.start_state, other.start_state)
-        accept_states = set_product(self.accept_states, other.accept_states)
-        return DFA(states, alphabet, transition, start_state, accept_states)
+        return self.intersection(other)
     
     def __or__(self, other):
         """
         Returns the union of two DFAs
         """
-        states = set_product(self.states, other.states)
-        alphabet = self.alphabet | other.alphabet
-        transition = {}
-        self.transition = self.transition_ext(alphabet)
-        other.transition = other.transition_ext(alphabet)
-        for state in states:
-            transition[state] = {}
-            state_transitions = transition[state]
-            for symbol in alphabet:
-                state_transitions.update({symbol : (self.transition[state[0]][symbol],
-                                                    other.transition[state[1]][symbol])})
-        start_state = (self.start_state, other.start_state)
-        accept_states = set_product(self.accept_states, other.states) | set_product(self.states, other.accept_states)
-        return DFA(states, alphabet, transition, start_state, accept_states)
+        return self.union(other)
     
     def __sub__(self, other):
         """
         Returns the relative complement of a DFA from other DFA
         """
-        return self & -other
+        return self.difference(other)
+    
+    def intersection(self, other, lazy=False):
+        """
+        Returns the intersection of two DFAs, with only the pairs of states
+            reachable from the pair of start states, as a LazyDFA if lazy is True
+        """
+        return product([self, other], all, self.alphabet & other.alphabet, lazy)
+    
+    def union(self, other, lazy=False):
+        """
+        Returns the union of two DFAs, with only the pairs of states reachable
+            from the pair of start states, as a LazyDFA if lazy is True
+        """
+        return product([self, other], any, self.alphabet | other.alphabet, lazy)
+    
+    def difference(self, other, lazy=False):
+        """
+        Returns the relative complement of a DFA from other DFA, with only the
+            pairs of states reachable from the pair of start states, as a
+            LazyDFA if lazy is True
+        """
+        return product([self, other], lambda accepts: accepts[0] and not accepts[1],
+                       self.alphabet & other.alphabet, lazy)
+    
+    # Decision Procedures
+    def equivalent(self, other, witness=False):
+        """
+        Returns True if the DFA accepts the same strings as other DFA, otherwise
+            False, or the pair of the result and a shortest string accepted by
+            exactly one of them, None if equivalent, if witness is True
+        """
+        string = distinguishing_string(self, other)
+        return (string is None, string) if witness else string is None
+    
+    def is_subset(self, other, witness=False):
+        """
+        Returns True if the strings accepted by the DFA are accepted by other
+            DFA, otherwise False, or the pair of the result and a shortest string
+            accepted by the DFA but not by other, None if a subset, if witness is True
+        """
+        string = distinguishing_string(self, other, inclusion=True)
+        return (string is None, string) if witness else string is None
     
     # Concatenation and Star
+    def __add__(self, other):
+        """
+        Returns the concatenation of two DFAs
+        """
+        return self.concat(other)
+    
+    @instrumented("DFA.concat")
+    def concat(self, other, minimize=True):
+        """
+        Returns the concatenation of two DFAs, built by a subset construction
+            on the fly whose states are the pairs of a state of the DFA and the
+            set of states of other DFA reachable from the start state of other
+            after each accepted prefix, only those reachable from the start
+            state, minimized if minimize is True. A DFA moves to the rejecting
+            state None on the symbols outside its alphabet
+        """
+        transition1, transition2 = self.transition, other.transition
+        alphabet1, alphabet2 = self.alphabet, other.alphabet
+        accept_states1, accept_states2 = self.accept_states, other.accept_states
+        def successor(state, symbol):
+            state1, substates = state
+            if state1 is not None:
+                state1 = transition1[state1][symbol] if symbol in alphabet1 else None
+            if symbol in alphabet2:
+                substates = {transition2[substate][symbol] for substate in substates}
+            else:
+                substates = set()
+            if state1 in accept_states1:
+                substates.add(other.start_state)
+            return (state1, _frozenset(substates))
+        def is_accept(state):
+            return not state[1].isdisjoint(accept_states2)
+        start_state = (self.start_state, _frozenset({other.start_state}
+                                                    if self.start_state in accept_states1 else ()))
+        M = LazyDFA(start_state, alphabet1 | alphabet2, successor, is_accept).to_DFA()
+        return M.minimize() if minimize else M
+    
+    @instrumented("DFA.star")
+    def star(self, minimize=True):
+        """
+        Returns the Kleene star of a DFA, built by a subset construction on the
+            fly whose states are the sets of states of the DFA reached after
+            each accepted prefix, with a flag marking the accepting start state,
+            only those reachable from the start state, minimized if minimize is True
+        """
+        transition = self.transition
+        accept_states = self.accept_states
+        def successor(state, symbol):
+            substates = {transition[substate][symbol] for substate in state[0]}
+            if not substates.isdisjoint(accept_states):
+                substates.add(self.start_state)
+            return (_frozenset(substates), False)
+        def is_accept(state):
+            return state[1] or not state[0].isdisjoint(accept_states)
+        start_state = (_frozenset({self.start_state}), True)
+        M = LazyDFA(start_state, self.alphabet, successor, is_accept).to_DFA()
+        return M.minimize() if minimize else M
     
     # DFA Minimization
+    @instrumented("DFA.strip")
     def strip(self):
         """
         Returns an equivalent DFA with unreachable states removed
@@ -295,357 +1233,2959 @@ class DFA():
         while NewStates:
             TempState = set()
             for state in NewStates:
-                for symbol in self.alphabet:
-                    TempState = TempState | {self.transition[state][symbol]}
+                TempState.update(self.transition[state][symbol] for symbol in self.alphabet)
             NewStates = TempState - ReachableStates
-            ReachableStates = ReachableStates | NewStates
+            ReachableStates |= NewStates
         states = ReachableStates
         accept_states = ReachableStates & self.accept_states
         transition = self.transition.copy()
         for state in self.states - states:
             transition.pop(state)
+        if _stats is not None:
+            _stats.count("DFA.strip.removed", len(self.states) - len(states))
         return DFA(states, self.alphabet, transition, self.start_state, accept_states)
 
+    @instrumented("DFA.minimize")
     def minimize(self):
         """
-        Returns the minimal equivalent DFA
+        Returns the minimal equivalent DFA, whose states are the equivalence
+            classes found by Hopcroft's partition refinement
         """
         self = self.strip()
-        # Denote adjacency matrix G as AdjMat
-        AdjMat = {}
-        for (state, other_state) in set_product(self.states, self.states):
-            AdjMat.update({(state, other_state): 0})
-        for (state, other_state) in set_product(self.accept_states, self.states - self.accept_states):
-            AdjMat[(state, other_state)] = 1
-            AdjMat[(other_state, state)] = 1
-        while True:
-            AdjMat_old = AdjMat.copy()
-            for (state, other_state) in set_product(self.states, self.states - {state}):
-                    for symbol in self.alphabet:
-                        if AdjMat[(self.transition[state][symbol], self.transition[other_state][symbol])] == 1:
-                            AdjMat[(state, other_state)] = 1
-                            AdjMat[(other_state, state)] = 1
-            if AdjMat_old == AdjMat:
-                break
-        states = set()
-        accept_states = set()
+        M = self.relabel()
+        k = M.width
+        block_of = hopcroft(M.table, k, M.accept)
+        classes = [set() for _ in range(max(block_of, default=-1) + 1)]
+        for state, block in enumerate(block_of):
+            classes[block].add(M.labels[state])
+        states = [equivalence_class(equiv_states) for equiv_states in classes]
         transition = {}
-        for state in self.states:
-            equiv_states = {state}
-            for other_state in self.states - equiv_states:
-                if AdjMat[(state, other_state)] == 0:
-                    equiv_states = equiv_states | {other_state}
-            equiv_states = equivalence_class(equiv_states)
-            states = states | {equiv_states}
-            if state == self.start_state:
-                start_state = equiv_states
-            if state in self.accept_states:
-                accept_states = accept_states | {equiv_states}
-        for equiv_states in states:
-            transition[equiv_states] = {}
-            state_transitions = transition[equiv_states]
-            for symbol in self.alphabet:
-                for state in equiv_states:
-                    current_state = self.transition[state][symbol]
-                    for other_equiv_state in states:
-                        if current_state in other_equiv_state:
-                            equiv_states_transition = other_equiv_state
-                    break
-                state_transitions.update({symbol: equiv_states_transition})
-        return DFA(states, self.alphabet, transition, start_state, accept_states)
+        accept_states = set()
+        for state, block in enumerate(block_of):
+            equiv_states = states[block]
+            if equiv_states in transition:
+                continue
+            transition[equiv_states] = {symbol: states[block_of[M.table[state*k + column]]]
+                                        for symbol, column in M.symbol_index.items()}
+            if M.accept[state]:
+                accept_states.add(equiv_states)
+        start_state = states[block_of[M.start_state]]
+        if _stats is not None:
+            _stats.count("DFA.minimize.classes", len(states))
+        return DFA(set(states), self.alphabet, transition, start_state, accept_states)
 
 
-class NFA():
+class CompiledDFA():
     """
-    Class for Nondeterministic Finite Automata (DFA)
+    Class for the compiled form of a DFA, with states numbered 0..n-1, the
+        symbols in classes numbered 0..k-1 and a flat transition table
     
     Attributes
     ----------
-        states : set
-            collection of states
-        alphabet : set with the empty string ''
-            collection of symbols and empty string
-        transition : dict
-            transition function of the form transition[state][symbol] = [set of states]
-        start_state : str
+        table : array
+            flat transition table of the form table[state*k + class] = state
+        symbols : list
+            the symbols of the alphabet
+        classes : list
+            classes[i] is the class of symbols[i], the symbols of a class moving
+            every state to the same state, default as the class i
+        width : int
+            the number of classes k
+        symbol_index : dict
+            symbol_index[symbol] is the class of the symbol
+        start_state : int
             the starting state
-        accept_states : set
-            the accepting or final states
+        accept : bytearray
+            accept[state] is 1 if the state is accepting, otherwise 0
+        labels : list
+            the original states, labels[i] is the state numbered i
     """
     
-    def __init__(self, states=set(), alphabet=set(), transition=dict,
-                 start_state=None, accept_states=set()):
+    def __init__(self, table, symbols, start_state=0, accept=bytearray(), labels=None, classes=None):
         "Class initialization"
-        self.states = set(states)
-        self.alphabet = set(alphabet)
-        self.transition = transition
+        self.table = table
+        self.symbols = list(symbols)
+        self.classes = list(range(len(self.symbols))) if classes is None else list(classes)
+        self.width = max(self.classes, default=-1) + 1
+        self.symbol_index = dict(zip(self.symbols, self.classes))
         self.start_state = start_state
-        self.accept_states = set(accept_states)
+        self.accept = accept
+        self.labels = list(range(len(accept))) if labels is None else labels
     
     def __repr__(self):
         """
         Class representation
         """
-        return "Nondeterministic Finite Automaton (NFA) at " + f"{hex(id(self))}"
+        return "Compiled Deterministic Finite Automaton (DFA) at " + f"{hex(id(self))}"
     
-    def __str__(self):
+    def __len__(self):
         """
-        String representation
+        Returns the number of states
         """
-        str_self = (
-            self.__repr__() + "\n"
-            + "States           : " + f"{self.states}" + "\n"
-            + "Alphabet         : " + f"{self.alphabet}" + "\n"
-            + "Start State      : " + f"{self.start_state}" + "\n"
-            + "Accept States    : " + f"{self.accept_states}" + "\n"
-            +  self.str_transition()
-        )
-        return delete_apostrophe(str_self)  
-        
-    def str_transition(self):
+        return len(self.accept)
+    
+    def step(self, state, symbol):
         """
-        String representation of the transition function
+        Returns the state reached from state by reading symbol
         """
-        string  = "Transitions: state, symbol -> set of states"
-        for state in self.transition:
-            state_transitions = self.transition[state]
-            for symbol in self.alphabet | {''}:
-                symbol_str = symbol
-                state_str = f"{state}"
-                next_state_str = f"{state_transitions[symbol]}"
-                if symbol == '':
-                    symbol_str = eps
-                if state == set():
-                    state_str = phi
-                if state_transitions[symbol] == set():
-                    next_state_str = phi
-                string += "\n\t" + state_str + " , " + symbol_str + " -> "+ next_state_str
+        return self.table[state*self.width + self.symbol_index[symbol]]
+    
+    def run(self, input_string="", state=None, block_size=1 << 16):
+        """
+        Returns the state reached after reading the input string from state,
+            default as the start state. A bytes-like input string is read
+            without decoding, its byte b being the symbol chr(b): blocks of
+            block_size bytes are translated to classes by bytes.translate() if
+            there are fewer than 255 classes, otherwise each byte indexes the
+            list byte_columns()
+        """
+        table = self.table
+        k = self.width
+        if state is None:
+            state = self.start_state
+        if isinstance(input_string, bytes_types):
+            data = memoryview(input_string).cast('B')
+            columns = self.byte_columns()
+            try:
+                if k < 255:
+                    translation = self._byte_translation
+                    for start in range(0, len(data), block_size):
+                        block = data[start:start + block_size].tobytes().translate(translation)
+                        if block.find(255) >= 0:
+                            raise TypeError
+                        for column in block:
+                            state = table[state*k + column]
+                else:
+                    for column in map(columns.__getitem__, data):
+                        state = table[state*k + column]
+            except TypeError:
+                raise KeyError(next(byte_symbols[byte] for byte in data
+                                    if columns[byte] is None)) from None
+            return state
+        for column in map(self.symbol_index.__getitem__, input_string):
+            state = table[state*k + column]
+        return state
+    
+    def byte_columns(self):
+        """
+        Returns the list whose b-th entry is the class of the symbol chr(b),
+            or None if chr(b) is not a symbol
+        """
+        if not hasattr(self, "_byte_columns"):
+            self._byte_columns = list(map(self.symbol_index.get, byte_symbols))
+            # Table of bytes.translate() to the classes, 255 if not a symbol
+            if self.width < 255:
+                self._byte_translation = bytes(255 if column is None else column
+                                               for column in self._byte_columns)
+        return self._byte_columns
+    
+    def accepts(self, input_string=""):
+        """
+        Returns True if the compiled DFA accepts the input string,
+            default as the empty string, otherwise False
+        """
+        return self.accept[self.run(input_string)] == 1
+    
+    def encode_many(self, strings, lengths=None):
+        """
+        Returns the padded NumPy matrix of symbol classes of the input strings
+            and the array of their lengths, the padding being the class k. The
+            strings may be bytes-like, read as in CompiledDFA.run()
+        """
+        if np is None:
+            raise ImportError("encode_many requires NumPy")
+        k = self.width
+        if lengths is None:
+            lengths = np.fromiter(map(len, strings), dtype=np.intp, count=len(strings))
+        width = int(lengths.max()) if len(strings) else 0
+        matrix = np.full((len(strings), width), k, dtype=np.intp)
+        # The entries of the mask are in the order of the concatenated strings
+        mask = np.arange(width) < lengths[:, None]
+        lookup = self._char_lookup()
+        joined = None
+        if lookup is not None:
+            for empty in ("", b""):
+                try:
+                    joined = empty.join(strings)
+                    break
+                except TypeError:
+                    pass
+        if joined is not None:
+            if isinstance(joined, str):
+                codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+            else:
+                codes = np.frombuffer(joined, dtype=np.uint8)
+            columns = lookup[np.minimum(codes, len(lookup) - 1)]
+            if (columns < 0).any():
+                raise KeyError(chr(codes[np.argmax(columns < 0)]))
+            matrix[mask] = columns
+        else:
+            symbol_index = self.symbol_index
+            matrix[mask] = [symbol_index[symbol] for string in strings for symbol in
+                            (map(byte_symbols.__getitem__, memoryview(string).cast('B'))
+                             if isinstance(string, bytes_types) else string)]
+        return matrix, lengths
+    
+    def _char_lookup(self):
+        """
+        Returns the NumPy array mapping a code point to its symbol class, or -1
+            if it is not a symbol, with a last entry -1 for larger code points.
+            Returns None if some symbol is not a single character
+        """
+        if not hasattr(self, "_lookup"):
+            self._lookup = None
+            if all(isinstance(symbol, str) and len(symbol) == 1 for symbol in self.symbols):
+                size = max(map(ord, self.symbols), default=0) + 2
+                self._lookup = np.full(size, -1, dtype=np.intp)
+                for symbol, column in self.symbol_index.items():
+                    self._lookup[ord(symbol)] = column
+        return self._lookup
+    
+    def accepts_many(self, strings, batch_size=65536):
+        """
+        Returns a NumPy boolean array whose i-th entry is True if the compiled DFA
+            accepts the i-th input string
+        """
+        states = self.run_many(strings, batch_size)
+        return np.frombuffer(self.accept, dtype=np.uint8).astype(bool)[states]
+    
+    def run_many(self, strings, batch_size=65536):
+        """
+        Returns a NumPy array whose i-th entry is the state reached after reading
+            the i-th input string from the start state
+        
+        The strings are sorted by length and encoded batch_size at a time into a
+            padded symbol matrix. Every string of a batch is then advanced one
+            symbol at a time by a single lookup into the flattened transition
+            table, whose padding column k leaves every state unchanged.
+        """
+        if np is None:
+            raise ImportError("run_many requires NumPy")
+        strings = list(strings)
+        n, k = len(self), self.width
+        table = np.empty((n, k + 1), dtype=np.intp)
+        table[:, :k] = np.frombuffer(self.table, dtype=np.intc).reshape(n, k)
+        table[:, k] = np.arange(n)
+        table = table.ravel()
+        lengths = np.fromiter(map(len, strings), dtype=np.intp, count=len(strings))
+        order = np.argsort(lengths, kind="stable")
+        result = np.empty(len(strings), dtype=np.intp)
+        for lo in range(0, len(strings), batch_size):
+            rows = order[lo:lo + batch_size]
+            batch = list(map(strings.__getitem__, rows.tolist()))
+            matrix, _ = self.encode_many(batch, lengths[rows])
+            states = np.full(len(rows), self.start_state, dtype=np.intp)
+            for columns in matrix.T:
+                states = table.take(states*(k + 1) + columns)
+            result[rows] = states
+        return result
+    
+    def transition_monoid(self, limit=256):
+        """
+        Returns the transition maps of the nonempty strings as a list of tuples,
+            the index in that list of the map of each symbol class, and the NumPy
+            composition table whose entry a*len(maps) + b is the index of the map
+            a followed by the map b. Returns None if there are more than limit maps
+        """
+        if getattr(self, "_monoid_limit", None) == limit:
+            return self._monoid
+        n, k = len(self), self.width
+        symbol_maps = [tuple(self.table[state*k + column] for state in range(n))
+                       for column in range(k)]
+        maps = list(dict.fromkeys(symbol_maps))
+        map_index = {mapping: idx for idx, mapping in enumerate(maps)}
+        generators = list(maps)
+        monoid = None
+        idx = 0
+        while idx < len(maps) and len(maps) <= limit:
+            for generator in generators:
+                product_map = tuple(generator[state] for state in maps[idx])
+                if product_map not in map_index:
+                    map_index[product_map] = len(maps)
+                    maps.append(product_map)
+            idx += 1
+        if len(maps) <= limit:
+            size = len(maps)
+            composition = np.empty(size*size, dtype=np.intp)
+            for a, first in enumerate(maps):
+                for b, second in enumerate(maps):
+                    composition[a*size + b] = map_index[tuple(second[state] for state in first)]
+            monoid = (maps, [map_index[mapping] for mapping in symbol_maps], composition)
+        self._monoid_limit, self._monoid = limit, monoid
+        return monoid
+    
+    def transition_map(self, input_string="", block_size=None, budget=1 << 22):
+        """
+        Returns the list whose i-th entry is the state reached after reading the
+            input string from the state i. The input is a str or a bytes-like
+            object whose byte b is read as the symbol chr(b).
+        
+        With NumPy and an alphabet of single characters, the maps of the single
+            symbols are composed pairwise, block_size symbols at a time, as
+            indices into the transition monoid when it is small. Otherwise the
+            maps of a block take block_size*n integers, so block_size defaults
+            to budget // n, and past budget // 64 states, as without NumPy, the
+            input is run once from every state but the sink states, which map
+            to themselves.
+        """
+        n = len(self)
+        lookup = self._char_lookup() if np is not None else None
+        monoid = self.transition_monoid() if lookup is not None and n**2 <= 1 << 16 else None
+        if lookup is None or (monoid is None and n > budget // 64):
+            k = self.width
+            mapping = list(range(n))
+            for state in range(n):
+                if any(self.table[state*k + symbol] != state for symbol in range(k)):
+                    mapping[state] = self.run(input_string, state)
+            return mapping
+        if monoid is not None:
+            maps, symbol_maps, composition = monoid
+            symbol_maps = np.array(symbol_maps, dtype=np.intp)
+            block_size = block_size or 1 << 20
+        else:
+            block_size = block_size or max(1, budget // n)
+        table = np.frombuffer(self.table, dtype=np.intc).reshape(n, self.width)
+        table = np.ascontiguousarray(table.T)
+        mapping = np.arange(n, dtype=np.intc)
+        for start in range(0, len(input_string), block_size):
+            block = input_string[start:start + block_size]
+            if isinstance(block, str):
+                codes = np.frombuffer(block.encode("utf-32-le"), dtype=np.uint32)
+            else:
+                codes = np.frombuffer(block, dtype=np.uint8)
+            columns = lookup[np.minimum(codes, len(lookup) - 1)]
+            if (columns < 0).any():
+                raise KeyError(chr(codes[np.argmax(columns < 0)]))
+            if not len(columns):
+                continue
+            if monoid is not None:
+                size = len(maps)
+                elements = symbol_maps[columns]
+                while len(elements) > 1:
+                    if len(elements) % 2:
+                        elements[-2] = composition[elements[-2]*size + elements[-1]]
+                        elements = elements[:-1]
+                    elements = composition.take(elements[0::2]*size + elements[1::2])
+                block_map = np.array(maps[elements[0]], dtype=np.intc)
+            else:
+                # maps[i][state] is the state reached from state by reading the i-th symbol
+                maps = table[columns]
+                while len(maps) > 1:
+                    if len(maps) % 2:
+                        maps[-2] = maps[-1][maps[-2]]
+                        maps = maps[:-1]
+                    maps = np.take_along_axis(maps[1::2], maps[0::2], axis=1)
+                block_map = maps[0]
+            mapping = block_map[mapping]
+        return mapping.tolist()
+    
+    def save(self, path):
+        """
+        Writes the compiled DFA to a file in the binary format of write_automaton()
+        """
+        write_automaton(path, "DFA", self.start_state, self.symbols, self.accept,
+                        self.table, self.labels, self.classes)
+    
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """
+        Returns the compiled DFA of a file written by CompiledDFA.save(), using
+            the memory-mapped transition table without a copy if use_mmap is True.
+            The labels are decoded the first time they are used
+        """
+        start_state, symbols, accept, table, labels, classes = read_automaton(path, "DFA", use_mmap)
+        return cls(table, symbols, start_state, accept, labels, classes)
+    
+    def to_DFA(self, relabeled=False):
+        """
+        Converts the compiled DFA back to a DFA, with the states numbered
+            0..n-1 if relabeled is True, otherwise with the original states
+        """
+        k = self.width
+        labels = range(len(self)) if relabeled else self.labels
+        transition = {}
+        for state, label in enumerate(labels):
+            row = self.table[state*k:(state+1)*k]
+            transition[label] = {symbol: labels[row[column]]
+                                 for symbol, column in self.symbol_index.items()}
+        accept_states = {labels[state] for state in range(len(self)) if self.accept[state]}
+        return DFA(set(labels), set(self.symbols), transition, labels[self.start_state],
+                   accept_states)
+
+
+class StreamMatcher():
+    """
+    Class for a resumable matcher that runs a DFA over an input given in chunks
+    
+    Attributes
+    ----------
+        dfa : CompiledDFA
+            the compiled DFA, compiled by DFA.relabel() if a DFA is given
+        encoding : str
+            the encoding used to decode chunks given as bytes, default is utf-8,
+            or None to read their bytes as symbols as in CompiledDFA.run()
+        state : int
+            the current state of the compiled DFA
+        position : int
+            the number of symbols read so far
+        offset : int
+            the number of bytes read so far from chunks given as bytes
+    """
+    
+    def __init__(self, M, encoding="utf-8"):
+        "Class initialization"
+        self.dfa = M.relabel() if isinstance(M, DFA) else M
+        self.encoding = encoding
+        self.reset()
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Stream Matcher at " + f"{hex(id(self))}" + " in state " + f"{self.state}"
+    
+    def reset(self):
+        """
+        Returns the matcher back at the start state with nothing read
+        """
+        self.state = self.dfa.start_state
+        self.position = 0
+        self.offset = 0
+        self._decoder = (codecs.getincrementaldecoder(self.encoding)()
+                         if self.encoding is not None else None)
+        return self
+    
+    def feed(self, chunk, final=False):
+        """
+        Reads the next chunk of the input, a str or a bytes-like object, and
+            returns the matcher. Bytes are decoded incrementally, so a character
+            may be split across chunks, or read without decoding if encoding is
+            None; final marks the end of the input.
+        """
+        if not isinstance(chunk, str):
+            chunk = memoryview(chunk).cast('B')
+            self.offset += len(chunk)
+            if self._decoder is not None:
+                chunk = self._decoder.decode(chunk, final)
+        self.state = self.dfa.run(chunk, self.state)
+        self.position += len(chunk)
+        return self
+    
+    def feed_file(self, path, chunk_size=1 << 20, use_mmap=True):
+        """
+        Reads a file from the current byte offset to its end and returns the
+            matcher, through a memory map or through fixed-size buffered reads
+            of chunk_size bytes, keeping at most one chunk in memory
+        """
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            if use_mmap and size > self.offset:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for start in range(self.offset, size, chunk_size):
+                            self.feed(view[start:start + chunk_size])
+                    finally:
+                        view.release()
+            else:
+                file.seek(self.offset)
+                buffer = bytearray(chunk_size)
+                with memoryview(buffer) as view:
+                    while True:
+                        nbytes = file.readinto(buffer)
+                        if not nbytes:
+                            break
+                        self.feed(view[:nbytes])
+        return self.feed(b"", final=True)
+    
+    def is_accepting(self):
+        """
+        Returns True if the input read so far is accepted, otherwise False
+        """
+        return self.dfa.accept[self.state] == 1
+    
+    def checkpoint(self):
+        """
+        Returns the state of the matcher, to be restored by restore()
+        """
+        decoder_state = self._decoder.getstate() if self._decoder is not None else None
+        return (self.state, self.position, self.offset, decoder_state)
+    
+    def restore(self, checkpoint):
+        """
+        Restores the matcher to a state returned by checkpoint() and returns it
+        """
+        self.state, self.position, self.offset, decoder_state = checkpoint
+        if self._decoder is not None:
+            self._decoder.setstate(decoder_state)
+        return self
+
+
+def accepts_file(M, path, encoding="utf-8", chunk_size=1 << 20, use_mmap=True):
+    """
+    Returns True if the DFA accepts the contents of a file, otherwise False,
+        reading its bytes as symbols without decoding if encoding is None
+    """
+    return StreamMatcher(M, encoding).feed_file(path, chunk_size, use_mmap).is_accepting()
+
+
+# Compiled DFA of the worker processes of accepts_parallel()
+_parallel_dfa = None
+
+def _parallel_init(M):
+    """
+    Sets the compiled DFA of a worker process
+    """
+    global _parallel_dfa
+    _parallel_dfa = M
+
+def _parallel_map(chunk):
+    """
+    Returns the transition map of a chunk in a worker process
+    """
+    return _parallel_dfa.transition_map(chunk)
+
+def _parallel_map_file(path, start, stop):
+    """
+    Returns the transition map of the bytes start to stop of a file in a worker process
+    """
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return _parallel_dfa.transition_map(view[start:stop])
+            finally:
+                view.release()
+
+def _parallel_workers(M, size, processes, chunk_size):
+    """
+    Returns the compiled DFA without its labels, the number of processes and
+        the chunk size for matching an input of a given size in parallel
+    """
+    if isinstance(M, DFA):
+        M = M.relabel()
+    M = CompiledDFA(M.table, M.symbols, M.start_state, M.accept, classes=M.classes)
+    processes = processes or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1 << 20, -(-size // (4*processes)))
+    return M, processes, chunk_size
+
+def accepts_parallel(M, input_string="", processes=None, chunk_size=None):
+    """
+    Returns True if the DFA accepts the input string, otherwise False, matching
+        chunks of chunk_size symbols in a pool of processes. Each chunk is run
+        from every state to get its transition map, and the maps are composed
+        in order from the start state. Bytes are read as in
+        CompiledDFA.transition_map().
+    """
+    M, processes, chunk_size = _parallel_workers(M, len(input_string), processes, chunk_size)
+    chunks = (input_string[start:start + chunk_size]
+              for start in range(0, len(input_string), chunk_size))
+    current_state = M.start_state
+    with ProcessPoolExecutor(processes, initializer=_parallel_init, initargs=(M,)) as pool:
+        for mapping in pool.map(_parallel_map, chunks):
+            current_state = mapping[current_state]
+    return M.accept[current_state] == 1
+
+def accepts_file_parallel(M, path, processes=None, chunk_size=None):
+    """
+    Returns True if the DFA accepts the contents of a file, otherwise False,
+        as in accepts_parallel() but with every worker process mapping its own
+        chunks of the file, so no input is sent between processes
+    """
+    size = os.path.getsize(path)
+    M, processes, chunk_size = _parallel_workers(M, size, processes, chunk_size)
+    starts = range(0, size, chunk_size)
+    current_state = M.start_state
+    with ProcessPoolExecutor(processes, initializer=_parallel_init, initargs=(M,)) as pool:
+        stops = [min(start + chunk_size, size) for start in starts]
+        for mapping in pool.map(_parallel_map_file, [path]*len(starts), starts, stops):
+            current_state = mapping[current_state]
+    return M.accept[current_state] == 1
+
+
+class LazyDFA():
+    """
+    Class for a DFA whose states and transitions are built the first time a
+        match needs them, keeping the transitions of at most cache_size states
+        and evicting the least recently used state when the cache is full
+    
+    Attributes
+    ----------
+        start_state : hashable
+            the starting state
+        alphabet : set
+            collection of symbols
+        successor : function
+            successor(state, symbol) returns the state reached from state by reading symbol
+        is_accept : function
+            is_accept(state) returns True if the state is accepting
+        cache_size : int
+            the maximum number of states kept in the cache
+        hits, misses, evictions : int
+            the number of transitions found in the cache, the number of transitions
+            built, and the number of states evicted from the cache
+    """
+    
+    def __init__(self, start_state, alphabet, successor, is_accept, cache_size=4096):
+        "Class initialization"
+        self.start_state = start_state
+        self.alphabet = set(alphabet)
+        self.successor = successor
+        self.is_accept = is_accept
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # state -> (is accepting, {symbol: next_state})
+        self._cache = OrderedDict()
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Lazy Deterministic Finite Automaton (DFA) at " + f"{hex(id(self))}"
+    
+    def __len__(self):
+        """
+        Returns the number of states in the cache
+        """
+        return len(self._cache)
+    
+    def _row(self, state):
+        """
+        Returns the cached acceptance and transitions of a state, building them if needed
+        """
+        cache = self._cache
+        row = cache.get(state)
+        if row is None:
+            row = (self.is_accept(state), {})
+            cache[state] = row
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+                self.evictions += 1
+        else:
+            cache.move_to_end(state)
+        return row
+    
+    def step(self, state, symbol):
+        """
+        Returns the state reached from state by reading symbol
+        """
+        state_transitions = self._row(state)[1]
+        try:
+            next_state = state_transitions[symbol]
+            self.hits += 1
+        except KeyError:
+            if symbol not in self.alphabet:
+                raise
+            next_state = self.successor(state, symbol)
+            state_transitions[symbol] = next_state
+            self.misses += 1
+        return next_state
+    
+    def is_accepting(self, state):
+        """
+        Returns the cached value of is_accept(state)
+        """
+        return self._row(state)[0]
+    
+    def accepts(self, input_string=""):
+        """
+        Returns True if the lazy DFA accepts the input string,
+            default as the empty string, otherwise False. The byte b of a
+            bytes-like input string is read as the symbol chr(b)
+        """
+        if isinstance(input_string, bytes_types):
+            input_string = map(byte_symbols.__getitem__, memoryview(input_string).cast('B'))
+        current_state = self.start_state
+        for current_symbol in input_string:
+            current_state = self.step(current_state, current_symbol)
+        return self._row(current_state)[0]
+    
+    def cache_info(self):
+        """
+        Returns the cache counters as a dict
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._cache), "cache_size": self.cache_size}
+    
+    def to_DFA(self):
+        """
+        Converts the lazy DFA to a DFA with all the states reachable from the start state
+        """
+        symbols = sorted_symbols(self.alphabet)
+        transition = {}
+        accept_states = set()
+        NewStates = [self.start_state]
+        while NewStates:
+            state = NewStates.pop()
+            if state in transition:
+                continue
+            transition[state] = {symbol: self.successor(state, symbol) for symbol in symbols}
+            NewStates.extend(transition[state].values())
+            if self.is_accept(state):
+                accept_states.add(state)
+        return DFA(set(transition), self.alphabet, transition, self.start_state, accept_states)
+
+
+@instrumented("product")
+def product(automata, accept, alphabet, lazy=False, cache_size=4096, stay=True):
+    """
+    Returns the product of a list of DFAs over the alphabet, whose states are
+        the tuples of their states reachable from the tuple of start states.
+        A DFA stays in its state on the symbols outside its alphabet, as in
+        DFA.transition_ext(), or moves to the rejecting state None if stay is
+        False. A tuple is accepting if accept returns True on the list of whether
+        each of its states is accepting. If lazy is True, returns a LazyDFA
+        building the tuples on demand, keeping at most cache_size of them
+    """
+    transitions = [M.transition for M in automata]
+    alphabets = [M.alphabet for M in automata]
+    accept_states = [M.accept_states for M in automata]
+    def successor(state, symbol):
+        return tuple(transition[component][symbol]
+                     if symbol in component_alphabet and component is not None
+                     else component if stay else None
+                     for component, transition, component_alphabet
+                     in zip(state, transitions, alphabets))
+    def is_accept(state):
+        return accept([component in component_accept_states
+                       for component, component_accept_states in zip(state, accept_states)])
+    start_state = tuple(M.start_state for M in automata)
+    M = LazyDFA(start_state, alphabet, successor, is_accept, cache_size)
+    if lazy:
+        return M
+    M = M.to_DFA()
+    if _stats is not None:
+        _stats.count("product.states", len(M.states))
+    return M
+
+def distinguishing_string(M1, M2, inclusion=False):
+    """
+    Returns a shortest string accepted by exactly one of two DFAs, or accepted
+        by M1 but not by M2 if inclusion is True, or None if there is none. The
+        pairs of states are explored breadth-first from the pair of start states
+        and, for equivalence, pairs already merged by the union-find of
+        Hopcroft and Karp are skipped. A DFA moves to the rejecting state None
+        on the symbols outside its alphabet
+    """
+    symbols = sorted_symbols(M1.alphabet | M2.alphabet)
+    transition1, transition2 = M1.transition, M2.transition
+    alphabet1, alphabet2 = M1.alphabet, M2.alphabet
+    accept_states1, accept_states2 = M1.accept_states, M2.accept_states
+    start_state = (M1.start_state, M2.start_state)
+    # parent[pair] is the pair and the symbol it was first reached from
+    parent = {start_state: None}
+    # Union-find over the states of M1 and M2, tagged 0 and 1
+    leader = {(0, M1.start_state): (1, M2.start_state)}
+    def find(x):
+        root = x
+        while root in leader:
+            root = leader[root]
+        while x != root:
+            leader[x], x = root, leader[x]
+        return root
+    queue = [start_state]
+    idx = 0
+    string = None
+    while idx < len(queue):
+        pair = queue[idx]
+        idx += 1
+        state1, state2 = pair
+        accept1 = state1 in accept_states1
+        if accept1 != (state2 in accept_states2) and (accept1 or not inclusion):
+            string = []
+            while parent[pair] is not None:
+                pair, symbol = parent[pair]
+                string.append(symbol)
+            string = ''.join(reversed(string))
+            break
+        for symbol in symbols:
+            next_state1 = (transition1[state1][symbol]
+                           if state1 is not None and symbol in alphabet1 else None)
+            if next_state1 is None and inclusion:
+                continue
+            next_state2 = (transition2[state2][symbol]
+                           if state2 is not None and symbol in alphabet2 else None)
+            next_pair = (next_state1, next_state2)
+            if inclusion:
+                if next_pair in parent:
+                    continue
+            else:
+                root1, root2 = find((0, next_state1)), find((1, next_state2))
+                if root1 == root2:
+                    continue
+                leader[root1] = root2
+            parent[next_pair] = (pair, symbol)
+            queue.append(next_pair)
+    if _stats is not None:
+        _stats.count("distinguishing_string.pairs", idx)
+    return string
+
+def intersect(*automata, lazy=False):
+    """
+    Returns the intersection of DFAs as one product over flat tuples of states,
+        as a LazyDFA if lazy is True
+    """
+    alphabet = set.intersection(*(M.alphabet for M in automata))
+    return product(automata, all, alphabet, lazy)
+
+def union(*automata, lazy=False):
+    """
+    Returns the union of DFAs as one product over flat tuples of states,
+        as a LazyDFA if lazy is True
+    """
+    alphabet = set.union(*(M.alphabet for M in automata))
+    return product(automata, any, alphabet, lazy)
+
+
+class Searcher():
+    """
+    Class for finding the spans of the substrings of a text accepted by a DFA,
+        by a forward scan that finds where each match ends and a reverse scan
+        that recovers where it starts
+    
+    The forward scanning automaton is a LazyDFA whose states are the tuples of
+        the live states of the threads started at each position of the text,
+        earliest first, dropping a thread in the same state as an earlier one.
+        The reverse automaton is a LazyDFA whose states are the bitmasks of the
+        states from which the text read backwards leads to an accepting state.
+        A symbol outside the alphabet is read as the extra column width, which
+        kills every thread, so that the scan restarts after it.
+    
+    Attributes
+    ----------
+        dfa : CompiledDFA
+            the compiled minimal DFA
+        longest : bool
+            True for leftmost-longest matches, False for leftmost-shortest matches
+    """
+    
+    def __init__(self, M, longest=True, cache_size=4096):
+        "Class initialization"
+        self.dfa = M = M.minimize().relabel() if isinstance(M, DFA) else M
+        self.longest = longest
+        n, k = len(M), M.width
+        table, accept, start_state = M.table, M.accept, M.start_state
+        # Inverse transitions as bitmasks, inverse[symbol][state] = bitmask of states
+        inverse = [[0]*n for _ in range(k)]
+        for state in range(n):
+            for symbol in range(k):
+                inverse[symbol][table[state*k + symbol]] |= 1 << state
+        # The live states can reach an accepting state
+        live = [False]*n
+        NewStates = [state for state in range(n) if accept[state]]
+        for state in NewStates:
+            live[state] = True
+        while NewStates:
+            state = NewStates.pop()
+            for symbol in range(k):
+                for other_state in iter_bits(inverse[symbol][state]):
+                    if not live[other_state]:
+                        live[other_state] = True
+                        NewStates.append(other_state)
+        self._start = (start_state,) if live[start_state] else ()
+        
+        def advance(threads, symbol):
+            if symbol == k:
+                return ()
+            next_threads = []
+            for state in threads:
+                next_state = table[state*k + symbol]
+                if live[next_state] and next_state not in next_threads:
+                    next_threads.append(next_state)
+            return tuple(next_threads)
+        
+        def advance_and_start(threads, symbol):
+            threads = advance(threads, symbol)
+            return threads if start_state in threads else threads + self._start
+        
+        def first_accepting(threads):
+            return next((idx for idx, state in enumerate(threads) if accept[state]), -1)
+        
+        def reverse(states, symbol):
+            Reach = 0
+            for state in iter_bits(states):
+                Reach |= inverse[symbol][state]
+            return Reach
+        
+        inverse.append([0]*n)
+        symbols = range(k + 1)
+        self.forward = LazyDFA(self._start, symbols, advance_and_start, first_accepting, cache_size)
+        self.extend = LazyDFA(self._start, symbols, advance, first_accepting, cache_size)
+        self.backward = LazyDFA(sum(1 << state for state in range(n) if accept[state]), symbols,
+                                reverse, lambda states: bool(states >> start_state & 1), cache_size)
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Searcher at " + f"{hex(id(self))}"
+    
+    def finditer(self, text, pos=0):
+        """
+        Yields the (start, end) spans of the non-overlapping matches in text
+            from position pos, leftmost first. The byte b of a bytes-like text
+            is read as the symbol chr(b)
+        """
+        k = self.dfa.width
+        if isinstance(text, bytes_types):
+            text = memoryview(text).cast('B')
+            columns = [k if column is None else column for column in self.dfa.byte_columns()]
+        else:
+            columns = defaultdict(lambda: k, self.dfa.symbol_index)
+        forward, extend, backward = self.forward, self.extend, self.backward
+        n = len(text)
+        while pos <= n and self._start:
+            threads = self._start
+            i = pos
+            first = forward.is_accepting(threads)
+            while first < 0 and i < n:
+                threads = forward.step(threads, columns[text[i]])
+                i += 1
+                first = forward.is_accepting(threads)
+            if first < 0:
+                return
+            # The accepting thread has found its shortest match, so only the
+            #   threads started before it are kept for leftmost-shortest matches
+            end = i
+            keep = first + 1 if self.longest else first
+            threads = threads[:keep]
+            while threads and i < n:
+                threads = extend.step(threads, columns[text[i]])
+                i += 1
+                first = extend.is_accepting(threads)
+                if first >= 0:
+                    end = i
+                    keep = first + 1 if self.longest else first
+                    threads = threads[:keep]
+            # The match starts at the smallest position from which text[start:end] is accepted
+            states = backward.start_state
+            start = end
+            for i in range(end - 1, pos - 1, -1):
+                states = backward.step(states, columns[text[i]])
+                if not states:
+                    break
+                if backward.is_accepting(states):
+                    start = i
+            yield (start, end)
+            pos = end if end > start else end + 1
+    
+    def search(self, text, pos=0):
+        """
+        Returns the (start, end) span of the first match in text from position pos,
+            or None if there is no match
+        """
+        return next(self.finditer(text, pos), None)
+
+
+class NFA():
+    """
+    Class for Nondeterministic Finite Automata (DFA)
+    
+    Attributes
+    ----------
+        states : set
+            collection of states
+        alphabet : set with the empty string ''
+            collection of symbols and empty string
+        transition : dict
+            transition function of the form transition[state][symbol] = [set of states]
+        start_state : str
+            the starting state
+        accept_states : set
+            the accepting or final states
+    """
+    
+    def __init__(self, states=set(), alphabet=set(), transition=dict,
+                 start_state=None, accept_states=set()):
+        "Class initialization"
+        self.states = set(states)
+        self.alphabet = set(alphabet)
+        self.transition = transition
+        self.start_state = start_state
+        self.accept_states = set(accept_states)
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Nondeterministic Finite Automaton (NFA) at " + f"{hex(id(self))}"
+    
+    def __str__(self):
+        """
+        String representation
+        """
+        str_self = (
+            self.__repr__() + "\n"
+            + "States           : " + f"{self.states}" + "\n"
+            + "Alphabet         : " + f"{self.alphabet}" + "\n"
+            + "Start State      : " + f"{self.start_state}" + "\n"
+            + "Accept States    : " + f"{self.accept_states}" + "\n"
+            +  self.str_transition()
+        )
+        return delete_apostrophe(str_self)  
+        
+    def str_transition(self):
+        """
+        String representation of the transition function
+        """
+        string  = "Transitions: state, symbol -> set of states"
+        for state in self.transition:
+            state_transitions = self.transition[state]
+            for symbol in self.alphabet | {''}:
+                symbol_str = symbol
+                state_str = f"{state}"
+                next_state_str = f"{state_transitions[symbol]}"
+                if symbol == '':
+                    symbol_str = eps
+                if state == set():
+                    state_str = phi
+                if state_transitions[symbol] == set():
+                    next_state_str = phi
+                string += "\n\t" + state_str + " , " + symbol_str + " -> "+ next_state_str
         return string
     
-    def state_diagram(self):
+    def state_diagram(self):
+        """
+        Converts the NFA class to a graphviz Digraph class
+        """
+        graph = Digraph()
+        graph.attr(rankdir = "LR", center="True", label=self.__repr__(), labelloc="t", fontsize="11pt")
+        graph.node("entry", "", shape="none")
+        for state in self.states - self.accept_states:
+            graph.node(str(state), delete_apostrophe(str(state)), fixedsize="False", shape="circle",
+                       fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
+        for state in self.accept_states:
+            graph.node(str(state), delete_apostrophe(str(state)), fixedsize="False", shape="doublecircle",
+                       fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
+        graph.edge("entry", str(self.start_state), arrowhead="vee", arrowsize="0.25")
+        for state, other_state, symbols in self.edges():
+            graph.edge(str(state), str(other_state), edge_label(symbols), arrowhead="vee",
+                       arrowsize="0.25", fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
+        return graph
+    
+    def edges(self, states=None):
+        """
+        Yields the triples (state, next state, symbols) of the transitions of
+            the NFA from states, default as all the states, grouped by pair of
+            states, with the empty string '' as the symbol of the empty string
+            transitions, inverting each row once
+        """
+        for state in self.states if states is None else states:
+            targets = {}
+            for symbol, next_states in self.transition[state].items():
+                for next_state in next_states:
+                    targets.setdefault(next_state, []).append(symbol)
+            for next_state, symbols in targets.items():
+                yield state, next_state, symbols
+    
+    def to_dot(self, file, collapse=True, max_states=None, around=None, radius=1):
+        """
+        Writes the state diagram of the NFA in the DOT language to a path or a
+            text file, as in write_dot()
+        """
+        write_dot(self, file, collapse, max_states, around, radius)
+    
+    @instrumented("NFA.relabel")
+    def relabel(self):
+        """
+        Returns the relabeled states of NFA in natural numbers
+            starting at 0, compiled to a CompiledNFA
+        """
+        symbols = sorted_symbols(self.alphabet)
+        labels = []
+        state_index = {}
+        idx = 0
+        for state in chain([self.start_state], self.states):
+            if state in state_index:
+                continue
+            state_index[state] = len(labels)
+            labels.append(state)
+            while idx < len(labels):
+                state_transitions = self.transition[labels[idx]]
+                for symbol in chain(symbols, ['']):
+                    for next_state in state_transitions.get(symbol, ()):
+                        if next_state not in state_index:
+                            state_index[next_state] = len(labels)
+                            labels.append(next_state)
+                idx += 1
+        # Empty string transitions and their closures as bitmasks over the state numbers
+        empty = [0]*len(labels)
+        for state, label in enumerate(labels):
+            for next_state in self.transition[label].get('', ()):
+                empty[state] |= 1 << state_index[next_state]
+        closure = []
+        for state in range(len(labels)):
+            Reach = NewStates = 1 << state
+            while NewStates:
+                TempStates = 0
+                for somestate in iter_bits(NewStates):
+                    TempStates |= empty[somestate]
+                NewStates = TempStates & ~Reach
+                Reach |= NewStates
+            closure.append(Reach)
+        successors = []
+        for symbol in symbols:
+            symbol_successors = []
+            for label in labels:
+                Reach = 0
+                for next_state in self.transition[label][symbol]:
+                    Reach |= closure[state_index[next_state]]
+                symbol_successors.append(Reach)
+            successors.append(symbol_successors)
+        accept_mask = 0
+        for state in self.accept_states:
+            if state in state_index:
+                accept_mask |= 1 << state_index[state]
+        return CompiledNFA(successors, closure, symbols, closure[0] if labels else 0,
+                           accept_mask, labels)
+    
+    def save(self, path):
+        """
+        Writes the NFA to a file in the binary format of write_automaton(), with
+            the transition array holding the offsets offsets[state*(k+1) + symbol]
+            into the array of target states that follows them, the empty string
+            being the symbol numbered k
+        """
+        symbols = sorted_symbols(self.alphabet)
+        labels = list(chain([self.start_state], self.states - {self.start_state}))
+        state_index = {state: idx for idx, state in enumerate(labels)}
+        offsets = array('i', [0])
+        targets = array('i')
+        for state in labels:
+            state_transitions = self.transition[state]
+            for symbol in chain(symbols, ['']):
+                targets.extend(state_index[next_state]
+                               for next_state in state_transitions.get(symbol, ()))
+                offsets.append(len(targets))
+        accept = [state in self.accept_states for state in labels]
+        write_automaton(path, "NFA", 0, symbols, accept, offsets + targets, labels)
+    
+    @staticmethod
+    def load(path, use_mmap=True):
+        """
+        Returns the NFA of a file written by NFA.save()
+        """
+        start_state, symbols, accept, table, labels, _ = read_automaton(path, "NFA", use_mmap)
+        labels = list(labels)
+        columns = list(chain(symbols, ['']))
+        size = len(labels)*len(columns)
+        transition = {}
+        for state, label in enumerate(labels):
+            transition[label] = {}
+            for column, symbol in enumerate(columns):
+                entry = state*len(columns) + column
+                transition[label][symbol] = {labels[next_state] for next_state
+                                             in table[size + 1 + table[entry]:size + 1 + table[entry + 1]]}
+        accept_states = {label for label, flag in zip(labels, accept) if flag}
+        return NFA(set(labels), set(symbols), transition, labels[start_state], accept_states)
+    
+    def stats(self):
+        """
+        Returns the statistics of NFA as a dict: the numbers of states, symbols,
+            accept states, transitions and empty string transitions, the density
+            of transitions among the triples of state, symbol and state, and the
+            estimated memory in bytes
+        """
+        n, k = len(self.states), len(self.alphabet)
+        transitions = sum(len(self.transition[state][symbol])
+                          for state in self.states for symbol in self.alphabet)
+        empty_transitions = sum(len(self.transition[state].get('', ())) for state in self.states)
+        return {
+            "States": n,
+            "Symbols": k,
+            "Accept States": len(self.accept_states),
+            "Transitions": transitions,
+            "Eps Transitions": empty_transitions,
+            "Density": transitions / (n*n*k) if n and k else 0.0,
+            "Memory": deep_sizeof(self.states) + deep_sizeof(self.transition)
+                      + deep_sizeof(self.accept_states),
+        }
+    
+    def print_stats(self):
+        """
+        Prints the statistics of NFA
+        """
+        string = self.__repr__()
+        for name, value in self.stats().items():
+            string += "\n" + f"{name:<17}: " + (f"{value:.4g}" if isinstance(value, float) else f"{value}")
+        print(string)
+    
+    def freeze(self):
+        """
+        Returns the frozen NFA of the NFA, as in freeze()
+        """
+        return freeze(self)
+    
+    def to_RegEx(self):
+        """
+        Converts NFA to RegEx by state elimination, as in GNFA.to_tree()
+        """
+        return GNFA.from_NFA(self).to_RegEx()
+    
+    def reverse(self):
+        """
+        Returns the NFA accepting the reverses of the strings accepted by the NFA,
+            with every transition reversed, a new start state with empty string
+            transitions to the accepting states, and the start state as its only
+            accepting state
+        """
+        start_state = 'q0`'
+        while start_state in self.states:
+            start_state += '`'
+        transition = {state: {symbol: set() for symbol in chain(self.alphabet, [''])}
+                      for state in chain(self.states, [start_state])}
+        for state in self.states:
+            for symbol, next_states in self.transition[state].items():
+                for next_state in next_states:
+                    transition[next_state][symbol].add(state)
+        transition[start_state][''] = set(self.accept_states)
+        return NFA(self.states | {start_state}, self.alphabet, transition, start_state,
+                   {self.start_state})
+    
+    def accepts_via_DFA(self, input_string=""):
+        """
+        Returns True if input string is accepted by converting to DFA then checking by DFA.accept()
+        """
+        M = self.to_DFA()
+        return M.accepts(input_string)
+        
+    def accepts(self, input_string=""):
+        """
+        Returns True if the NFA accepts the NFA accepts the input string,
+            default as the empty string, otherwise False, computing the closure
+            of each reached state once. To match many strings, keep the
+            CompiledNFA returned by NFA.relabel() and use its accepts() instead.
+            The byte b of a bytes-like input string is read as the symbol chr(b).
+            Timed in the body as in DFA.accepts()
+        """
+        stats = _stats
+        if stats is not None:
+            start = time.perf_counter()
+        if isinstance(input_string, bytes_types):
+            input_string = map(byte_symbols.__getitem__, memoryview(input_string).cast('B'))
+        closures = {}
+        CurrentStates = self.reach(self.start_state)
+        for current_symbol in input_string:
+            if not CurrentStates:
+                break
+            CurrentStates = self.subset_transition(CurrentStates, current_symbol, closures)
+        if stats is not None:
+            stats.add_time("NFA.accepts", time.perf_counter() - start)
+        return bool(CurrentStates & self.accept_states)
+        
+    def finditer(self, text, longest=True):
+        """
+        Yields the (start, end) spans of the non-overlapping substrings of text
+            accepted by the NFA, as in DFA.finditer()
+        """
+        return Searcher(self.to_DFA(), longest).finditer(text)
+    
+    def search(self, text, longest=True):
+        """
+        Returns the (start, end) span of the first substring of text accepted
+            by the NFA, as in DFA.search()
+        """
+        return Searcher(self.to_DFA(), longest).search(text)
+    
+    def reach(self, state):
+        """
+        Returns the reachable states of a state by following at least 0 empty string transition
+        """
+        Reach = {state}
+        NewStates = {state}
+        while NewStates:
+            TempStates = set()
+            for somestate in NewStates:
+                empty_string = ''
+                reached_states = set(self.transition[somestate][empty_string])
+                TempStates = TempStates | reached_states
+            NewStates = TempStates - Reach
+            Reach = Reach | NewStates
+        if _stats is not None:
+            _stats.count("NFA.reach.closures")
+        return _frozenset(Reach)
+        
+    def subset_transition(self, substates, symbol, closures=None):
+        """
+        Returns the set of states reached from a set of states by reading symbol
+            and then following empty string transitions, reusing the closures
+            in the dict closures if given
+        """
+        if closures is None:
+            closures = {}
+        Reach = set()
+        for state in substates:
+            for reached_state in self.transition[state][symbol]:
+                if reached_state not in closures:
+                    closures[reached_state] = self.reach(reached_state)
+                Reach |= closures[reached_state]
+        return _frozenset(Reach)
+    
+    @instrumented("NFA.to_DFA")
+    def to_DFA(self, lazy=False, cache_size=4096, reduce=False):
+        """
+        Converts NFA to DFA, building only the sets of states reachable from
+            the start state. If lazy is True, returns a LazyDFA that builds them
+            the first time they are needed, keeping at most cache_size of them.
+            If reduce is True, converts the NFA reduced by NFA.reduce() instead
+        """
+        if reduce:
+            return self.reduce().to_DFA(lazy, cache_size)
+        closures = {}
+        start_state = self.reach(self.start_state)
+        if lazy:
+            return LazyDFA(start_state, self.alphabet,
+                           lambda substates, symbol: self.subset_transition(substates, symbol, closures),
+                           lambda substates: bool(substates & self.accept_states), cache_size)
+        states = {start_state}
+        transition = {}
+        accept_states = set()
+        NewStates = [start_state]
+        while NewStates:
+            substates = NewStates.pop()
+            transition[substates] = {}
+            for symbol in self.alphabet:
+                Reach = self.subset_transition(substates, symbol, closures)
+                transition[substates].update({symbol : Reach})
+                if Reach not in states:
+                    states.add(Reach)
+                    NewStates.append(Reach)
+            if (substates & self.accept_states):
+                accept_states = accept_states | {substates}
+        if _stats is not None:
+            _stats.count("NFA.to_DFA.subset_states", len(states))
+        return DFA(states, self.alphabet, transition, start_state, accept_states)
+    
+    # Decision Procedures
+    def is_universal(self, witness=False, use_simulation=True):
+        """
+        Returns True if the NFA accepts every string over its alphabet, otherwise
+            False, or the pair of the result and a string it rejects, None if
+            universal, if witness is True. The subsumption by simulation is
+            skipped if use_simulation is False, as in antichain_counterexample()
+        """
+        string = antichain_counterexample(None, self.relabel(), use_simulation)
+        return (string is None, string) if witness else string is None
+    
+    def is_subset(self, other, witness=False, use_simulation=True):
+        """
+        Returns True if the strings accepted by the NFA are accepted by other
+            NFA, otherwise False, or the pair of the result and a string accepted
+            by the NFA but not by other, None if a subset, if witness is True.
+            See NFA.is_universal() for use_simulation
+        """
+        string = antichain_counterexample(self.relabel(), other.relabel(), use_simulation)
+        return (string is None, string) if witness else string is None
+    
+    def equivalent(self, other, witness=False, use_simulation=True):
+        """
+        Returns True if the NFA accepts the same strings as other NFA, otherwise
+            False, or the pair of the result and a string accepted by exactly
+            one of them, None if equivalent, if witness is True. See
+            NFA.is_universal() for use_simulation
+        """
+        N1, N2 = self.relabel(), other.relabel()
+        string = antichain_counterexample(N1, N2, use_simulation)
+        if string is None:
+            string = antichain_counterexample(N2, N1, use_simulation)
+        return (string is None, string) if witness else string is None
+    
+    # NFA Reduction
+    @instrumented("NFA.reduce")
+    def reduce(self):
+        """
+        Returns an equivalent NFA without empty string transitions, unreachable
+            states and dead states, whose states equivalent under forward
+            simulation and then under backward simulation are merged into
+            equivalence classes, as computed by simulation()
+        """
+        N = self.relabel()
+        symbols = N.symbols
+        state_index = {state: idx for idx, state in enumerate(N.labels)}
+        # Remove empty string transitions: a state reads the symbols read by its
+        #   closure and is accepting if its closure has an accepting state
+        successors = []
+        for symbol in symbols:
+            moves = [0]*len(N)
+            for state, label in enumerate(N.labels):
+                for next_state in self.transition[label][symbol]:
+                    moves[state] |= 1 << state_index[next_state]
+            symbol_successors = []
+            for state in range(len(N)):
+                Reach = 0
+                for somestate in iter_bits(N.closure[state]):
+                    Reach |= moves[somestate]
+                symbol_successors.append(Reach)
+            successors.append(symbol_successors)
+        accept_mask = 0
+        for state in range(len(N)):
+            if N.closure[state] & N.accept_mask:
+                accept_mask |= 1 << state
+        # Keep the states reachable from the start state that reach an accepting state
+        reachable = NewStates = 1
+        while NewStates:
+            TempStates = 0
+            for state in iter_bits(NewStates):
+                for symbol_successors in successors:
+                    TempStates |= symbol_successors[state]
+            NewStates = TempStates & ~reachable
+            reachable |= NewStates
+        alive = NewStates = accept_mask & reachable
+        while NewStates:
+            TempStates = 0
+            for state in iter_bits(reachable & ~alive):
+                if any(symbol_successors[state] & NewStates for symbol_successors in successors):
+                    TempStates |= 1 << state
+            NewStates = TempStates
+            alive |= NewStates
+        if not alive & 1:
+            transition = {self.start_state: {symbol: set() for symbol in chain(symbols, [''])}}
+            return NFA({self.start_state}, self.alphabet, transition, self.start_state, set())
+        kept = list(iter_bits(alive))
+        renumber = {state: idx for idx, state in enumerate(kept)}
+        def renumbered(states):
+            Reach = 0
+            for state in iter_bits(states & alive):
+                Reach |= 1 << renumber[state]
+            return Reach
+        C = CompiledNFA([[renumbered(symbol_successors[state]) for state in kept]
+                         for symbol_successors in successors],
+                        [1 << idx for idx in range(len(kept))], symbols, 1,
+                        renumbered(accept_mask), [[N.labels[state]] for state in kept])
+        # Merge the states equivalent under forward and then backward simulation
+        C = quotient(C, simulation(C, C))
+        R = C.reverse()
+        C = quotient(C, simulation(R, R))
+        states = [labels[0] if len(labels) == 1 else equivalence_class(labels)
+                  for labels in C.labels]
+        transition = {}
+        for state, label in enumerate(states):
+            transition[label] = {symbol: {states[next_state] for next_state
+                                          in iter_bits(C.successors[column][state])}
+                                 for column, symbol in enumerate(symbols)}
+            transition[label][''] = set()
+        accept_states = {states[state] for state in iter_bits(C.accept_mask)}
+        return NFA(set(states), self.alphabet, transition, states[0], accept_states)
+    
+    # Regular Operations of NFAs
+    def __or__(self, other):
+        """
+        Returns the union of two NFAs
+        """
+        start_state = 'start'
+        states = self.states | other.states | {start_state}
+        alphabet = self.alphabet | other.alphabet
+        transition = self.transition.copy()
+        for state in self.states:
+            for symbol in other.alphabet - self.alphabet:
+                transition[state].update({symbol : set()})
+        for state in other.states:
+            transition[state] = {}
+            for symbol in alphabet | {''}:
+                if symbol in (other.alphabet | ''):
+                    transition[state].update({symbol : other.transition[state][symbol]})
+                else:
+                    transition[state].update({symbol : set()})
+        transition[start_state] = {}
+        transition[start_state].update({'' : {self.start_state, other.start_state}})
+        for symbol in alphabet:
+            transition[start_state].update({symbol : set()})
+        accept_states = self.accept_states | other.accept_states
+        return NFA(states, alphabet, transition, start_state, accept_states)
+    
+    def __add__(self, other):
+        """
+        Returns the concatenation of two NFAs
+        """
+        states = self.states | other.states
+        alphabet = self.alphabet | other.alphabet
+        transition = self.transition.copy()
+        for state in self.states:
+            transition[state] = {}
+            for symbol in other.alphabet - self.alphabet:
+                transition[state].update({symbol : set()})
+        for state in self.accept_states:
+            transition[state] = {}
+            transition[state].update({'' : transition[state][''] | {other.start_state}})
+        for state in other.states:
+            transition[state] = {}
+            for symbol in alphabet | {''}:
+                if symbol in (other.alphabet | ''):
+                    transition[state].update({symbol : other.transition[state][symbol]})
+                else:
+                    transition[state].update({symbol : set()})
+        return NFA(states, alphabet, transition, self.start_state, other.accept_states)
+        
+    def __mul__(self):
+        """
+        Returns the star of NFA
+        """
+        start_state = 'q0`'
+        empty_string = ''
+        states = self.states | {start_state}
+        accept_states = self.accept_states | self.start_state
+        transition = {}
+        transition[start_state] = {}
+        transition[start_state].update({empty_string : {self.start_state}})
+        for symbol in self.alphabet:
+            transition[start_state].update({symbol : set()})
+        for state in self.state:
+            transition[symbol] = {}
+            if state in self.states - self.accept_states:
+                for symbol in (self.alphabet | empty_string):
+                    transition[state].update({symbol : self.transition[state][symbol]})
+            else:
+                for symbol in self.alphabet:
+                    transition[state].update({symbol : self.transition[state][symbol]})
+        for state in self.accept_states:
+            transition[state] = {}
+            transition[state].update({empty_string : self.transition[state][empty_string]} | {self.start_state})
+        return NFA(states, self.alphabet, transition, start_state, accept_states)
+                
+    
+class CompiledNFA():
+    """
+    Class for the compiled form of an NFA, with states numbered 0..n-1, sets of
+        states held as integer bitmasks and the empty string closures precomputed
+    
+    Attributes
+    ----------
+        successors : list
+            successors[symbol][state] is the bitmask of the states reached from state
+            by reading the symbol numbered symbol and then following empty string
+            transitions
+        closure : list
+            closure[state] is the bitmask of the states reached from state by
+            following empty string transitions, as in NFA.reach()
+        symbols : list
+            the symbols of the alphabet, symbols[i] is the symbol numbered i
+        start_states : int
+            the bitmask of the closure of the starting state
+        accept_mask : int
+            the bitmask of the accepting states
+        labels : list
+            the original states, labels[i] is the state numbered i
+    """
+    
+    def __init__(self, successors, closure, symbols, start_states=1, accept_mask=0, labels=None):
+        "Class initialization"
+        self.successors = successors
+        self.closure = closure
+        self.symbols = list(symbols)
+        self.symbol_index = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+        self.start_states = start_states
+        self.accept_mask = accept_mask
+        self.labels = list(range(len(closure))) if labels is None else labels
+        # Byte tables of each symbol, built on first use
+        self._byte_tables = [None]*len(self.symbols)
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Compiled Nondeterministic Finite Automaton (NFA) at " + f"{hex(id(self))}"
+    
+    def __len__(self):
+        """
+        Returns the number of states
+        """
+        return len(self.closure)
+    
+    def byte_tables(self, column):
+        """
+        Returns the byte tables of the symbol numbered column, where
+            tables[j][b] is the union of the successors of the states 8*j + i
+            over the set bits i of the byte b, or None if the compiled NFA has
+            more than byte_table_states states, as the tables take about 4*n^2
+            bytes per symbol
+        """
+        tables = self._byte_tables[column]
+        if tables is None and len(self) <= byte_table_states:
+            symbol_successors = self.successors[column]
+            tables = []
+            for offset in range(0, len(self), 8):
+                table = [0]*256
+                for byte in range(1, 256):
+                    low = byte & -byte
+                    state = offset + low.bit_length() - 1
+                    table[byte] = table[byte ^ low]
+                    if state < len(self):
+                        table[byte] |= symbol_successors[state]
+                tables.append(table)
+            self._byte_tables[column] = tables
+        return tables
+    
+    def image(self, states, column):
+        """
+        Returns the bitmask of the states reached from the bitmask of states
+            by reading the symbol numbered column, through the byte tables if
+            there are, otherwise by the union of the successors of each state
+        """
+        Reach = 0
+        tables = self.byte_tables(column)
+        if tables is None:
+            symbol_successors = self.successors[column]
+            for state in iter_bits(states):
+                Reach |= symbol_successors[state]
+            return Reach
+        for table in tables:
+            if not states:
+                break
+            Reach |= table[states & 255]
+            states >>= 8
+        return Reach
+    
+    def step(self, states, symbol):
+        """
+        Returns the bitmask of the states reached from the bitmask of states
+            by reading symbol
+        """
+        return self.image(states, self.symbol_index[symbol])
+    
+    def run(self, input_string="", states=None):
+        """
+        Returns the bitmask of the states reached after reading the input string
+            from the bitmask of states, default as the closure of the start state.
+            The byte b of a bytes-like input string is read as the symbol chr(b)
+        """
+        if states is None:
+            states = self.start_states
+        all_tables = self._byte_tables
+        if isinstance(input_string, bytes_types):
+            input_string = map(byte_symbols.__getitem__, memoryview(input_string).cast('B'))
+        if len(self) > byte_table_states:
+            image = self.image
+            for column in map(self.symbol_index.__getitem__, input_string):
+                states = image(states, column)
+            return states
+        for column in map(self.symbol_index.__getitem__, input_string):
+            tables = all_tables[column] or self.byte_tables(column)
+            Reach = 0
+            for table in tables:
+                if not states:
+                    break
+                Reach |= table[states & 255]
+                states >>= 8
+            states = Reach
+        return states
+    
+    def accepts(self, input_string=""):
+        """
+        Returns True if the compiled NFA accepts the input string,
+            default as the empty string, otherwise False
+        """
+        return bool(self.run(input_string) & self.accept_mask)
+    
+    def states_of(self, states):
+        """
+        Returns the set of original states of a bitmask of states
+        """
+        return _frozenset(self.labels[state] for state in iter_bits(states))
+    
+    def reverse(self):
+        """
+        Returns the compiled NFA without empty string transitions reading the
+            strings in reverse, whose start states are the accepting states and
+            whose accepting states are the closure of the starting state
+        """
+        successors = []
+        for symbol_successors in self.successors:
+            reversed_successors = [0]*len(self)
+            for state, next_states in enumerate(symbol_successors):
+                for next_state in iter_bits(next_states):
+                    reversed_successors[next_state] |= 1 << state
+            successors.append(reversed_successors)
+        return CompiledNFA(successors, [1 << state for state in range(len(self))],
+                           self.symbols, self.accept_mask, self.start_states, self.labels)
+
+
+def simulation(N1, N2):
+    """
+    Returns the forward simulation of the compiled NFA N1 by the compiled NFA
+        N2, where sim[state] is the bitmask of the states of N2 simulating the
+        state of N1: accepting if it is accepting, and on each symbol, each of
+        its successors is simulated by a successor of the state of N2. The
+        strings accepted from a state are accepted from the states simulating it
+    """
+    symbols = sorted_symbols(set(N1.symbols) | set(N2.symbols))
+    columns = [(N1.symbol_index.get(symbol), N2.symbol_index.get(symbol)) for symbol in symbols]
+    columns = [(column1, column2) for column1, column2 in columns if column1 is not None]
+    # predecessors[column2][state] is the bitmask of the states of N2 reaching state
+    predecessors = {}
+    for column1, column2 in columns:
+        if column2 is None:
+            continue
+        symbol_predecessors = [0]*len(N2)
+        for state, next_states in enumerate(N2.successors[column2]):
+            for next_state in iter_bits(next_states):
+                symbol_predecessors[next_state] |= 1 << state
+        predecessors[column2] = symbol_predecessors
+    # sources[state] is the set of the states of N1 reaching state
+    sources = [set() for _ in range(len(N1))]
+    for column1, column2 in columns:
+        for state, next_states in enumerate(N1.successors[column1]):
+            for next_state in iter_bits(next_states):
+                sources[next_state].add(state)
+    every = (1 << len(N2)) - 1
+    sim = [N2.accept_mask if N1.accept_mask >> state & 1 else every for state in range(len(N1))]
+    # allowed[state][column2] is the bitmask of the states of N2 reaching sim[state]
+    allowed = [None]*len(N1)
+    def allowed_of(state):
+        if allowed[state] is None:
+            state_allowed = {}
+            for column2, symbol_predecessors in predecessors.items():
+                Reach = 0
+                for somestate in iter_bits(sim[state]):
+                    Reach |= symbol_predecessors[somestate]
+                state_allowed[column2] = Reach
+            allowed[state] = state_allowed
+        return allowed[state]
+    NewStates = list(range(len(N1)))
+    pending = set(NewStates)
+    while NewStates:
+        state = NewStates.pop()
+        pending.discard(state)
+        states = sim[state]
+        for column1, column2 in columns:
+            if not states:
+                break
+            for next_state in iter_bits(N1.successors[column1][state]):
+                states &= allowed_of(next_state)[column2] if column2 is not None else 0
+                if not states:
+                    break
+        if states != sim[state]:
+            sim[state] = states
+            allowed[state] = None
+            for somestate in sources[state] - pending:
+                pending.add(somestate)
+                NewStates.append(somestate)
+    return sim
+
+def quotient(N, sim):
+    """
+    Returns the compiled NFA without empty string transitions N with the states
+        simulating each other under sim, as computed by simulation(N, N), merged,
+        whose labels are the lists of the labels of the merged states and whose
+        state 0 contains the state 0 of N
+    """
+    block_of = [-1]*len(N)
+    labels = []
+    for state in range(len(N)):
+        if block_of[state] >= 0:
+            continue
+        block_labels = []
+        for somestate in iter_bits(sim[state]):
+            if block_of[somestate] < 0 and sim[somestate] >> state & 1:
+                block_of[somestate] = len(labels)
+                block_labels.extend(N.labels[somestate])
+        block_of[state] = len(labels)
+        labels.append(block_labels or list(N.labels[state]))
+    if len(labels) == len(N):
+        return N
+    def merged(states):
+        Reach = 0
+        for state in iter_bits(states):
+            Reach |= 1 << block_of[state]
+        return Reach
+    successors = []
+    for symbol_successors in N.successors:
+        merged_successors = [0]*len(labels)
+        for state, next_states in enumerate(symbol_successors):
+            merged_successors[block_of[state]] |= merged(next_states)
+        successors.append(merged_successors)
+    return CompiledNFA(successors, [1 << state for state in range(len(labels))], N.symbols,
+                       merged(N.start_states), merged(N.accept_mask), labels)
+
+def antichain_counterexample(N1, N2, use_simulation=True):
+    """
+    Returns a string accepted by the compiled NFA N1 but not by the compiled
+        NFA N2, or None if there is none, or a string over the alphabet of N2
+        rejected by N2 if N1 is None. The pairs of a state of N1 and the set
+        of states of N2 reached by the same string are explored breadth-first,
+        skipping a pair if a pair with the same state of N1 and a subset of its
+        states of N2 was already found, so only an antichain of the sets of
+        states of N2 is kept instead of all of them. If use_simulation is True,
+        also skips a pair if its state of N1 is simulated by one of its states
+        of N2, as computed by simulation()
+    """
+    if N1 is None:
+        # The one state automaton accepting every string over the alphabet of N2
+        N1 = CompiledNFA([[1] for symbol in N2.symbols], [1], N2.symbols, 1, 1)
+    symbols = sorted_symbols(set(N1.symbols) | set(N2.symbols))
+    columns = [(symbol, N1.symbol_index[symbol], N2.symbol_index.get(symbol))
+               for symbol in symbols if symbol in N1.symbol_index]
+    accept_mask1, accept_mask2 = N1.accept_mask, N2.accept_mask
+    sim = simulation(N1, N2) if use_simulation else [0]*len(N1)
+    # antichain[state] is the set of minimal sets of states of N2 paired with state
+    antichain = {}
+    parent = {}
+    queue = []
+    for state in iter_bits(N1.start_states):
+        pair = (state, N2.start_states)
+        antichain[state] = {N2.start_states}
+        parent[pair] = None
+        queue.append(pair)
+    idx = 0
+    string = None
+    while idx < len(queue):
+        pair = queue[idx]
+        idx += 1
+        state, states = pair
+        if states not in antichain[state] or sim[state] & states:
+            continue
+        if accept_mask1 >> state & 1 and not states & accept_mask2:
+            string = []
+            while parent[pair] is not None:
+                pair, symbol = parent[pair]
+                string.append(symbol)
+            string = ''.join(reversed(string))
+            break
+        for symbol, column1, column2 in columns:
+            next_states1 = N1.successors[column1][state]
+            if not next_states1:
+                continue
+            Reach = N2.image(states, column2) if column2 is not None else 0
+            for next_state in iter_bits(next_states1):
+                if sim[next_state] & Reach:
+                    continue
+                minimal = antichain.setdefault(next_state, set())
+                if any(not (somestates & ~Reach) for somestates in minimal):
+                    continue
+                minimal.difference_update([somestates for somestates in minimal
+                                           if not (Reach & ~somestates)])
+                minimal.add(Reach)
+                next_pair = (next_state, Reach)
+                parent[next_pair] = (pair, symbol)
+                queue.append(next_pair)
+    if _stats is not None:
+        _stats.count("antichain_counterexample.pairs", idx)
+    return string
+    
+    
+# Reverse Matching
+@instrumented("choose_direction")
+def choose_direction(M, limit=4096):
+    """
+    Returns "forward" or "reverse", the direction in which the lazy determinization
+        of a DFA, NFA or CompiledNFA has fewer states. Both determinizations are
+        explored breadth-first in turn, one state at a time, until one of them is
+        complete with no more states than found in the other, or both have more
+        than limit states, then the direction with fewer states found is chosen
+    """
+    C = M.to_NFA() if isinstance(M, DFA) else M
+    C = C.relabel() if isinstance(C, NFA) else C
+    automata = (C, C.reverse())
+    seen = [{N.start_states} for N in automata]
+    queues = [[N.start_states] for N in automata]
+    indices = [0, 0]
+    while True:
+        done = [indices[d] == len(queues[d]) for d in (0, 1)]
+        over = [len(seen[d]) > limit for d in (0, 1)]
+        if done[0] and len(seen[0]) <= len(seen[1]):
+            direction = 0
+            break
+        if done[1] and len(seen[1]) < len(seen[0]):
+            direction = 1
+            break
+        if (done[0] or over[0]) and (done[1] or over[1]):
+            direction = 0 if len(seen[0]) <= len(seen[1]) else 1
+            break
+        for d, N in enumerate(automata):
+            if done[d] or over[d]:
+                continue
+            states = queues[d][indices[d]]
+            indices[d] += 1
+            for symbol in N.symbols:
+                next_states = N.step(states, symbol)
+                if next_states not in seen[d]:
+                    seen[d].add(next_states)
+                    queues[d].append(next_states)
+    if _stats is not None:
+        _stats.count("choose_direction.forward_states", len(seen[0]))
+        _stats.count("choose_direction.reverse_states", len(seen[1]))
+    return ("forward", "reverse")[direction]
+    
+    
+class ReverseMatcher():
+    """
+    Class for a matcher of whole inputs that reads them from their end, through
+        the lazy determinization of the reverse of an NFA, so that the strings
+        are matched anchored at their last symbol first. Languages such as the
+        strings with a 1 at the k-th position from the end have a forward DFA
+        of 2^k states but a reverse DFA of k + 1 states.
+    
+    Attributes
+    ----------
+        nfa : CompiledNFA
+            the compiled NFA read in the direction of the matcher, reversed by
+            CompiledNFA.reverse() if the direction is reverse
+        dfa : LazyDFA
+            the lazy determinization of nfa, whose states are bitmasks of its states
+        direction : str
+            "reverse" to read the input from its end, or "forward" to read it
+            from its start
+        state : int
+            the current state of the lazy DFA
+        position : int
+            the number of symbols read so far
+    """
+    
+    def __init__(self, M, direction="reverse", limit=4096, cache_size=4096):
+        """
+        Class initialization, with the direction chosen by choose_direction()
+            with limit if direction is None
+        """
+        C = M.to_NFA() if isinstance(M, DFA) else M
+        C = C.relabel() if isinstance(C, NFA) else C
+        if direction is None:
+            direction = choose_direction(C, limit)
+        if direction not in ("forward", "reverse"):
+            raise ValueError(f"direction must be 'forward' or 'reverse', not {direction!r}")
+        self.direction = direction
+        self.nfa = N = C.reverse() if direction == "reverse" else C
+        self.dfa = LazyDFA(N.start_states, N.symbols, N.step,
+                           lambda states: bool(states & N.accept_mask), cache_size)
+        self.reset()
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Reverse Matcher at " + f"{hex(id(self))}" + " reading " + f"{self.direction}"
+    
+    def reset(self):
+        """
+        Returns the matcher back at the start state with nothing read
+        """
+        self.state = self.dfa.start_state
+        self.position = 0
+        return self
+    
+    def feed(self, chunk):
+        """
+        Reads the next chunk of the input, a str or a bytes-like object whose
+            byte b is read as the symbol chr(b), and returns the matcher. In the
+            reverse direction the chunks are given from the last one to the first,
+            and each is read from its end through a reversed iterator or a
+            reversed memoryview, without copying it.
+        """
+        if isinstance(chunk, str):
+            symbols = reversed(chunk) if self.direction == "reverse" else chunk
+        else:
+            chunk = memoryview(chunk).cast('B')
+            symbols = map(byte_symbols.__getitem__,
+                          chunk[::-1] if self.direction == "reverse" else chunk)
+        step = self.dfa.step
+        state = self.state
+        for symbol in symbols:
+            state = step(state, symbol)
+        self.state = state
+        self.position += len(chunk)
+        return self
+    
+    def feed_file(self, path, chunk_size=1 << 20, use_mmap=True):
+        """
+        Reads the bytes of a file not read so far and returns the matcher, as
+            chunks of chunk_size bytes taken from the end of the file in the
+            reverse direction, through memoryview slices of a memory map or of
+            a buffer filled by fixed-size reads
+        """
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            if self.direction == "reverse":
+                spans = [(max(stop - chunk_size, 0), stop)
+                         for stop in range(size - self.position, 0, -chunk_size)]
+            else:
+                spans = [(start, min(start + chunk_size, size))
+                         for start in range(self.position, size, chunk_size)]
+            if use_mmap and spans:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for start, stop in spans:
+                            self.feed(view[start:stop])
+                    finally:
+                        view.release()
+            else:
+                buffer = bytearray(chunk_size)
+                with memoryview(buffer) as view:
+                    for start, stop in spans:
+                        file.seek(start)
+                        nbytes = file.readinto(view[:stop - start])
+                        self.feed(view[:nbytes])
+        return self
+    
+    def is_accepting(self):
+        """
+        Returns True if the input read so far is accepted, otherwise False
+        """
+        return self.dfa.is_accepting(self.state)
+    
+    def accepts(self, input_string=""):
+        """
+        Returns True if the input string, default as the empty string, is
+            accepted, reading it in the direction of the matcher, otherwise False
+        """
+        return self.reset().feed(input_string).is_accepting()
+    
+    
+# Frozen Automata
+"Frozen automata alive in the process, keyed by structure"
+_frozen = weakref.WeakValueDictionary()
+
+def freeze(M):
+    """
+    Returns the frozen automaton of a DFA or NFA, the same instance as an
+        alive frozen automaton of the same structure if there is one, so that
+        their cached derived results are shared
+    """
+    if isinstance(M, (FrozenDFA, FrozenNFA)):
+        return M
+    frozen = FrozenDFA(M) if isinstance(M, DFA) else FrozenNFA(M)
+    return _frozen.setdefault((type(frozen), frozen._key), frozen)
+
+def cached_result(method):
+    """
+    Returns a method without arguments of a frozen automaton whose result is
+        computed on first call and kept in the cache of the instance
+    """
+    @wraps(method)
+    def wrapper(self):
+        cache = self._cache
+        if method.__name__ in cache:
+            if _stats is not None:
+                _stats.count("frozen.cache_hits")
+            return cache[method.__name__]
+        result = cache[method.__name__] = method(self)
+        return result
+    return wrapper
+
+class FrozenDFA(DFA):
+    """
+    Class for an immutable DFA, hashed and compared by its structure, whose
+        derived automata are computed once and cached. Its sets are frozensets
+        and its transition function a read-only mapping of read-only rows.
+        See freeze() for sharing the instances of the same structure
+    """
+    def __init__(self, M):
+        "Class initialization from a DFA"
+        transition = MappingProxyType({state: MappingProxyType(dict(M.transition[state]))
+                                       for state in M.states})
+        for name, value in (("states", frozenset(M.states)), ("alphabet", frozenset(M.alphabet)),
+                            ("transition", transition), ("start_state", M.start_state),
+                            ("accept_states", frozenset(M.accept_states))):
+            object.__setattr__(self, name, value)
+        key = (self.alphabet, self.start_state, self.accept_states,
+               frozenset((state, frozenset(row.items())) for state, row in transition.items()))
+        object.__setattr__(self, "_key", key)
+        object.__setattr__(self, "_hash", hash(key))
+        object.__setattr__(self, "_cache", {})
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot set {name} of a frozen DFA")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete {name} of a frozen DFA")
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Frozen Deterministic Finite Automaton (DFA) at " + f"{hex(id(self))}"
+    
+    def __eq__(self, other):
+        return isinstance(other, FrozenDFA) and self._key == other._key
+    
+    def __hash__(self):
+        return self._hash
+    
+    def thaw(self):
+        """
+        Returns a mutable copy of the frozen DFA
+        """
+        transition = {state: dict(row) for state, row in self.transition.items()}
+        return DFA(self.states, self.alphabet, transition, self.start_state, self.accept_states)
+    
+    @cached_result
+    def relabel(self):
+        """
+        Returns the result of DFA.relabel(), cached
+        """
+        return DFA.relabel(self)
+    
+    @cached_result
+    def strip(self):
+        """
+        Returns the result of DFA.strip() as a frozen DFA, cached
+        """
+        return freeze(DFA.strip(self))
+    
+    @cached_result
+    def minimize(self):
+        """
+        Returns the result of DFA.minimize() as a frozen DFA, cached
+        """
+        return freeze(DFA.minimize(self))
+    
+    @cached_result
+    def to_NFA(self):
+        """
+        Returns the result of DFA.to_NFA() as a frozen NFA, cached
+        """
+        return freeze(DFA.to_NFA(self))
+
+class FrozenNFA(NFA):
+    """
+    Class for an immutable NFA, hashed and compared by its structure, whose
+        derived automata are computed once and cached, as in FrozenDFA
+    """
+    def __init__(self, N):
+        "Class initialization from an NFA"
+        transition = MappingProxyType({state: MappingProxyType({symbol: frozenset(next_states)
+                                       for symbol, next_states in N.transition[state].items()})
+                                       for state in N.states})
+        for name, value in (("states", frozenset(N.states)), ("alphabet", frozenset(N.alphabet)),
+                            ("transition", transition), ("start_state", N.start_state),
+                            ("accept_states", frozenset(N.accept_states))):
+            object.__setattr__(self, name, value)
+        key = (self.alphabet, self.start_state, self.accept_states,
+               frozenset((state, frozenset(row.items())) for state, row in transition.items()))
+        object.__setattr__(self, "_key", key)
+        object.__setattr__(self, "_hash", hash(key))
+        object.__setattr__(self, "_cache", {})
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot set {name} of a frozen NFA")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete {name} of a frozen NFA")
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Frozen Nondeterministic Finite Automaton (NFA) at " + f"{hex(id(self))}"
+    
+    def __eq__(self, other):
+        return isinstance(other, FrozenNFA) and self._key == other._key
+    
+    def __hash__(self):
+        return self._hash
+    
+    def thaw(self):
+        """
+        Returns a mutable copy of the frozen NFA
+        """
+        transition = {state: {symbol: set(next_states) for symbol, next_states in row.items()}
+                      for state, row in self.transition.items()}
+        return NFA(self.states, self.alphabet, transition, self.start_state, self.accept_states)
+    
+    @cached_result
+    def relabel(self):
+        """
+        Returns the result of NFA.relabel(), cached
+        """
+        return NFA.relabel(self)
+    
+    @cached_result
+    def reduce(self):
+        """
+        Returns the result of NFA.reduce() as a frozen NFA, cached
+        """
+        return freeze(NFA.reduce(self))
+    
+    def to_DFA(self, lazy=False, cache_size=4096, reduce=False):
+        """
+        Converts the frozen NFA to a frozen DFA, cached unless lazy is True,
+            as in NFA.to_DFA()
+        """
+        if lazy:
+            return NFA.to_DFA(self, lazy, cache_size, reduce)
+        key = ("to_DFA", reduce)
+        if key in self._cache:
+            if _stats is not None:
+                _stats.count("frozen.cache_hits")
+        else:
+            self._cache[key] = freeze(self.reduce().to_DFA() if reduce else NFA.to_DFA(self))
+        return self._cache[key]
+    
+    
+class RegEx():
+    """
+    Class for Regular Expression
+    
+    Attributes
+    ----------
+        string : str
+            input string to be verified as RegEx over the alphabet
+        alphabet : set
+            collection of symbols, default is binary
+    """
+    def __init__(self, string=str(), alphabet={'0', '1'}):
+        "Class Initialization"
+        self.string = string
+        self.alphabet = alphabet
+    
+    def __repr__(self):
+        "Class representation"
+        return "Regular Expression (RegEx) at " + f"{hex(id(self))}"\
+            + " over " + f"{self.alphabet}"
+    
+    def __str__(self):
+        "String representation"
+        return self.string
+    
+    def parse_expression(self):
+        """
+        Returns the parse tree of the regular expression, as in parse_expression()
+        """
+        return parse_expression(self.string, self.alphabet)
+    
+    def to_NFA(self):
+        """
+        Converts the regular expression to an NFA by Thompson's construction
+        """
+        return thompson_NFA(self.parse_expression(), self.alphabet)
+    
+    def to_DFA(self):
+        """
+        Returns the minimal DFA of the regular expression from the compile cache,
+            a frozen DFA shared by the callers, see FrozenDFA.thaw() for a copy
+        """
+        return compile_regex(self.string, frozenset(self.alphabet))
+    
+    def accepts(self, input_string=""):
+        """
+        Returns True if the regular expression matches the whole input string,
+            default as the empty string, otherwise False
+        """
+        return self.to_DFA().accepts(input_string)
+    
+
+def thompson_NFA(tree, alphabet):
+    """
+    Returns the NFA of a parse tree from parse_expression() by Thompson's
+        construction, with states 'q0', 'q1', ... and a single accepting state
+    """
+    alphabet = set(alphabet)
+    transition = {}
+    
+    def new_state():
+        state = f"q{len(transition)}"
+        transition[state] = {symbol: set() for symbol in alphabet | {''}}
+        return state
+    
+    def build(tree):
+        """
+        Returns the start and accepting states of the fragment of a parse tree
+        """
+        kind = tree[0]
+        if kind in ("symbol", "epsilon", "empty"):
+            start_state, accept_state = new_state(), new_state()
+            if kind == "symbol":
+                transition[start_state][tree[1]].add(accept_state)
+            elif kind == "epsilon":
+                transition[start_state][''].add(accept_state)
+            return start_state, accept_state
+        if kind == "concat":
+            start_state, accept_state = build(tree[1])
+            for subtree in tree[2:]:
+                next_start_state, next_accept_state = build(subtree)
+                transition[accept_state][''].add(next_start_state)
+                accept_state = next_accept_state
+            return start_state, accept_state
+        start_state, accept_state = new_state(), new_state()
+        if kind == "union":
+            for subtree in tree[1:]:
+                sub_start_state, sub_accept_state = build(subtree)
+                transition[start_state][''].add(sub_start_state)
+                transition[sub_accept_state][''].add(accept_state)
+        elif kind == "star":
+            sub_start_state, sub_accept_state = build(tree[1])
+            transition[start_state][''] |= {sub_start_state, accept_state}
+            transition[sub_accept_state][''] |= {sub_start_state, accept_state}
+        else:
+            raise ValueError(f"Unknown RegEx node {kind!r}")
+        return start_state, accept_state
+    
+    start_state, accept_state = build(tree)
+    return NFA(set(transition), alphabet, transition, start_state, {accept_state})
+
+@lru_cache(maxsize=4096)
+def compile_regex(string, alphabet=frozenset({'0', '1'})):
+    """
+    Returns the minimal DFA of a regular expression over an alphabet, given as
+        a frozenset, through parse_expression(), thompson_NFA() and NFA.to_DFA().
+        The results are kept in an LRU cache keyed by (string, alphabet), see
+        compile_regex.cache_info(), and returned as shared frozen DFAs by freeze()
+    """
+    return freeze(thompson_NFA(parse_expression(string, alphabet), alphabet).to_DFA().minimize())
+
+
+class MultiMatcher():
+    """
+    Class for matching an input against many patterns in one pass, through one
+        minimal DFA whose states carry the set of patterns they accept for
+    
+    Attributes
+    ----------
+        ids : list
+            the identifiers of the patterns, default 0..m-1
+        dfa : CompiledDFA
+            the combined DFA, accepting where at least one pattern accepts
+        tags : list
+            tags[state] is the frozenset of identifiers of the patterns that
+            accept at the state numbered state
+    """
+    
+    def __init__(self, automata, ids=None):
+        "Class initialization"
+        automata = [M if isinstance(M, DFA) else M.to_DFA() for M in automata]
+        self.ids = list(range(len(automata))) if ids is None else list(ids)
+        alphabet = set().union(*(M.alphabet for M in automata))
+        # Product of the patterns restricted to the reachable tuples of states,
+        #   where a pattern rejects on the symbols outside its alphabet
+        M = product(automata, any, alphabet, stay=False).relabel()
+        accept_states = [M.accept_states for M in automata]
+        tags = [frozenset(pattern_id for pattern_id, component, component_accept_states
+                          in zip(self.ids, state, accept_states)
+                          if component in component_accept_states)
+                for state in M.labels]
+        # Minimize with the tags as initial partition so that they are kept
+        k = M.width
+        block_of = hopcroft(M.table, k, tags)
+        num_blocks = max(block_of) + 1
+        table = array('i', [0])*(num_blocks*k)
+        self.tags = [None]*num_blocks
+        for state, block in enumerate(block_of):
+            if self.tags[block] is None:
+                self.tags[block] = tags[state]
+                table[block*k:(block + 1)*k] = array('i', (block_of[next_state]
+                    for next_state in M.table[state*k:(state + 1)*k]))
+        accept = bytearray(1 if tag else 0 for tag in self.tags)
+        self.dfa = CompiledDFA(table, M.symbols, block_of[M.start_state], accept,
+                               classes=M.classes)
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Multi-Pattern Matcher of " + f"{len(self.ids)}" + " patterns at " + f"{hex(id(self))}"
+    
+    def match(self, input_string=""):
+        """
+        Returns the frozenset of identifiers of the patterns that accept the input string
+        """
+        return self.tags[self.dfa.run(input_string)]
+    
+    def match_many(self, strings, batch_size=65536):
+        """
+        Returns the list of frozensets of identifiers of the patterns that accept
+            each input string, evaluated as a batch as in CompiledDFA.run_many()
+        """
+        return [self.tags[state] for state in self.dfa.run_many(strings, batch_size).tolist()]
+
+
+# Symbolic Automata
+"Largest code point read by symbolic automata"
+max_code_point = 0x10FFFF
+
+def merge_intervals(pairs):
+    """
+    Returns the sorted tuple of disjoint intervals (lo, hi) of code points
+        covering the given intervals, with overlapping and adjacent ones merged
+    """
+    merged = []
+    for lo, hi in sorted(pairs):
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return tuple(merged)
+
+def char_set(*ranges):
+    """
+    Returns the sorted tuple of disjoint intervals of code points of the
+        characters given as single characters, ranges "a-z", or pairs (lo, hi)
+        of characters or code points
+    """
+    pairs = []
+    for item in ranges:
+        if isinstance(item, str):
+            if len(item) == 1:
+                lo = hi = item
+            elif len(item) == 3 and item[1] == '-':
+                lo, hi = item[0], item[2]
+            else:
+                raise ValueError(f"{item!r} is not a character or a range of characters")
+        else:
+            lo, hi = item
+        lo = ord(lo) if isinstance(lo, str) else lo
+        hi = ord(hi) if isinstance(hi, str) else hi
+        if lo <= hi:
+            pairs.append((lo, hi))
+    return merge_intervals(pairs)
+
+def minterm_starts(automata):
+    """
+    Returns the sorted list of the first code points of the minterms of
+        symbolic automata, the coarsest intervals partitioning the code points
+        on which every transition label is either true or false
+    """
+    bounds = {0}
+    for M in automata:
+        for pairs in M.transition.values():
+            for intervals, _ in pairs:
+                for lo, hi in intervals:
+                    bounds.add(lo)
+                    bounds.add(hi + 1)
+    bounds.discard(max_code_point + 1)
+    return sorted(bounds)
+
+def minterms_of(intervals, starts):
+    """
+    Yields the indices of the minterms, given by their sorted first code
+        points, contained in the intervals
+    """
+    for lo, hi in intervals:
+        idx = bisect_left(starts, lo)
+        while idx < len(starts) and starts[idx] <= hi:
+            yield idx
+            idx += 1
+
+def intervals_of(minterms, starts):
+    """
+    Returns the sorted disjoint intervals covering the minterms, given by
+        their indices in increasing order and by their sorted first code points
+    """
+    pairs = []
+    for idx in minterms:
+        hi = starts[idx + 1] - 1 if idx + 1 < len(starts) else max_code_point
+        if pairs and pairs[-1][1] + 1 == starts[idx]:
+            pairs[-1] = (pairs[-1][0], hi)
+        else:
+            pairs.append((starts[idx], hi))
+    return tuple(pairs)
+
+def codes_of(input_string):
+    """
+    Returns an iterator over the code points of a str, or over the byte
+        values of a bytes-like input string
+    """
+    if isinstance(input_string, bytes_types):
+        return iter(memoryview(input_string).cast('B'))
+    return map(ord, input_string)
+
+
+class SymbolicDFA():
+    """
+    Class for a Deterministic Finite Automaton whose transitions are labelled
+        with sets of characters, given as sorted disjoint intervals of code
+        points, so that its size does not depend on the size of the alphabet.
+        A character on which a state has no transition is rejected.
+    
+    Attributes
+    ----------
+        states : set
+            collection of states
+        transition : dict
+            transition function of the form transition[state] = [(intervals, state)]
+            with disjoint intervals as returned by char_set()
+        start_state : str
+            the starting state
+        accept_states : set
+            the accepting or final states
+    """
+    
+    def __init__(self, states=set(), transition=dict, start_state=None, accept_states=set()):
+        "Class initialization"
+        self.states = states
+        self.transition = {state: [(merge_intervals(intervals), next_state)
+                                   for intervals, next_state in pairs]
+                           for state, pairs in transition.items()}
+        self.start_state = start_state
+        self.accept_states = accept_states
+        self._dispatch = {}
+    
+    def __repr__(self):
         """
-        Converts the NFA class to a graphviz Digraph class
+        Class representation
         """
-        graph = Digraph()
-        graph.attr(rankdir = "LR", center="True", label=self.__repr__(), labelloc="t", fontsize="11pt")
-        graph.node("entry", "", shape="none")
-        for state in self.states - self.accept_states:
-            graph.node(str(state), delete_apostrophe(str(state)), fixedsize="False", shape="circle",
-                       fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
-        for state in self.accept_states:
-            graph.node(str(state), delete_apostrophe(str(state)), fixedsize="False", shape="doublecircle",
-                       fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
-        graph.edge("entry", str(self.start_state), arrowhead="vee", arrowsize="0.25")
+        return "Symbolic Deterministic Finite Automaton (DFA) at " + f"{hex(id(self))}"
+    
+    def __str__(self):
+        """
+        String representation
+        """
+        string = self.__repr__()
+        string += "\nStates           : " + f"{self.states}"
+        string += "\nTransition       :"
         for state in self.states:
-            for other_state in self.states:
-                label = ",".join(get_keys_from_value(self.transition[state], {other_state}))
-                if label:
-                    graph.edge(str(state), str(other_state), label, arrowhead="vee", arrowsize="0.25",
-                           fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
-            symbol = ''
-            other_states = self.transition[state][symbol]
-            if other_state:
-                for other_state in other_states:
-                    graph.edge(str(state), str(other_state), eps, arrowhead="vee", arrowsize="0.25",
-                        fontname="Helvetica,Arial,sans-serif", fontsize="9pt")
-        return graph
+            for intervals, next_state in self.transition.get(state, []):
+                ranges = ", ".join(f"{chr(lo)!r}" if lo == hi else f"{chr(lo)!r}-{chr(hi)!r}"
+                                   for lo, hi in intervals)
+                string += "\n\t" + f"{state} -> {next_state} on [{ranges}]"
+        string += "\nStart State      : " + f"{self.start_state}"
+        string += "\nAccept States    : " + f"{self.accept_states}"
+        return string
     
-    # def relabel
+    @classmethod
+    def from_DFA(cls, M):
+        """
+        Returns the symbolic DFA of a DFA whose symbols are single characters
+        """
+        transition = {}
+        for state in M.states:
+            targets = {}
+            for symbol, next_state in M.transition[state].items():
+                targets.setdefault(next_state, []).append(symbol)
+            transition[state] = [(char_set(*symbols), next_state)
+                                 for next_state, symbols in targets.items()]
+        return cls(set(M.states), transition, M.start_state, set(M.accept_states))
     
-    # def print_stats
+    def to_DFA(self, alphabet):
+        """
+        Returns the DFA of the symbolic DFA over a finite alphabet of single
+            characters, with a rejecting state None for the missing transitions
+        """
+        transition = {None: {symbol: None for symbol in alphabet}}
+        for state in self.states:
+            transition[state] = {symbol: self.step(state, symbol) for symbol in alphabet}
+        return DFA(self.states | {None}, set(alphabet), transition, self.start_state,
+                   set(self.accept_states))
     
-    def accepts_via_DFA(self, input_string=""):
+    def _dispatch_of(self, state):
         """
-        Returns True if input string is accepted by converting to DFA then checking by DFA.accept()
+        Returns the sorted first and last code points of the intervals of the
+            transitions of state and their next states, built on first use
         """
-        M = self.to_DFA()
-        return M.accepts(input_string)
-        
+        dispatch = self._dispatch.get(state)
+        if dispatch is None:
+            ranges = sorted((lo, hi, next_state) for intervals, next_state
+                            in self.transition.get(state, []) for lo, hi in intervals)
+            for (_, hi, _), (lo, _, _) in zip(ranges, ranges[1:]):
+                if lo <= hi:
+                    raise ValueError(f"the transitions of {state} overlap")
+            dispatch = ([lo for lo, _, _ in ranges], [hi for _, hi, _ in ranges],
+                        [next_state for _, _, next_state in ranges])
+            self._dispatch[state] = dispatch
+        return dispatch
+    
+    def step(self, state, symbol):
+        """
+        Returns the state reached from state by reading a character or code
+            point, or None if there is no such transition
+        """
+        los, his, targets = self._dispatch_of(state)
+        code = ord(symbol) if isinstance(symbol, str) else symbol
+        idx = bisect_right(los, code) - 1
+        return targets[idx] if idx >= 0 and code <= his[idx] else None
+    
     def accepts(self, input_string=""):
         """
-        Returns True if the NFA accepts the NFA accepts the input string,
-            default as the empty string, otherwise False
+        Returns True if the symbolic DFA accepts the input string, a str or a
+            bytes-like object read as in CompiledDFA.run(), otherwise False.
+            Each character is dispatched by binary search on the intervals
         """
-        k = len(input_string) 
-        J = range(1, k)
-        empty_string = ''
-        if self.transition[self.start_state][empty_string]:
-            input_string = empty_string + input_string
-            J = range(k)
-        CurrentStates = {self.start_state}
-        for idx in J:
-            NewStates = set()
-            for state in CurrentStates:
-                currentsymbol = input_string[idx]
-                NewStates = NewStates | self.transition[state][currentsymbol]
-            ReachableStates = set()
-            for other_state in NewStates:
-                ReachableStates = ReachableStates | self.reach(other_state)
-            CurrentStates = NewStates | ReachableStates
-        if (CurrentStates & self.accept_states):
-            return True
-        else:
-            return False
-        
-    def reach(self, state):
+        state = self.start_state
+        dispatch = self._dispatch
+        for code in codes_of(input_string):
+            los, his, targets = dispatch.get(state) or self._dispatch_of(state)
+            idx = bisect_right(los, code) - 1
+            if idx < 0 or code > his[idx]:
+                return False
+            state = targets[idx]
+        return state in self.accept_states
+    
+    def minterm_DFA(self, starts):
         """
-        Returns the reachable states of a state by following at least 0 empty string transition
+        Returns the complete DFA of the symbolic DFA over the minterms with the
+            sorted first code points starts, as in minterm_starts(), whose
+            symbols are the first characters of the minterms, with a rejecting
+            state None for the missing transitions
         """
-        Reach = {state}
-        NewStates = {state}
-        while NewStates:
-            TempStates = set()
-            for somestate in NewStates:
-                empty_string = ''
-                reached_states = set(self.transition[somestate][empty_string])
-                TempStates = TempStates | reached_states
-            NewStates = TempStates - Reach
-            Reach = Reach | NewStates
-        return _frozenset(Reach)
-        
-    def to_DFA(self):
+        symbols = [chr(start) for start in starts]
+        transition = {None: dict.fromkeys(symbols)}
+        for state in self.states:
+            transition[state] = row = dict.fromkeys(symbols)
+            for intervals, next_state in self.transition.get(state, []):
+                for idx in minterms_of(intervals, starts):
+                    row[symbols[idx]] = next_state
+        return DFA(self.states | {None}, set(symbols), transition, self.start_state,
+                   set(self.accept_states))
+    
+    @classmethod
+    def from_minterm_DFA(cls, M, starts):
         """
-        Converts NFA to DFA
+        Returns the symbolic DFA of a DFA over the minterms with the sorted
+            first code points starts, as returned by SymbolicDFA.minterm_DFA(),
+            without the states from which no accepting state is reachable
         """
-        states = powerset(self.states)
-        start_state = self.reach(self.start_state)
+        symbols = [chr(start) for start in starts]
+        # The live states reach an accepting state
+        sources = {state: set() for state in M.states}
+        for state in M.states:
+            for next_state in M.transition[state].values():
+                sources[next_state].add(state)
+        live = set(M.accept_states)
+        NewStates = list(live)
+        while NewStates:
+            for state in sources[NewStates.pop()] - live:
+                live.add(state)
+                NewStates.append(state)
         transition = {}
-        accept_states = set()
-        for substates in states:
-            transition[substates] = {}
-            for symbol in self.alphabet:
-                Reach = set()
-                for state in substates:
-                    reached_states = set(self.transition[state][symbol])
-                    for reached_state in reached_states:
-                        Reach = Reach | self.reach(reached_state)
-                transition[substates].update({symbol : Reach})
-            if (substates & self.accept_states):
-                accept_states = accept_states | {substates}
-        return DFA(states, self.alphabet, transition, start_state, accept_states)
-        
-    # Regular Operations of NFAs
+        for state in live:
+            targets = {}
+            for idx, symbol in enumerate(symbols):
+                next_state = M.transition[state][symbol]
+                if next_state in live:
+                    targets.setdefault(next_state, []).append(idx)
+            transition[state] = [(intervals_of(minterms, starts), next_state)
+                                 for next_state, minterms in targets.items()]
+        transition.setdefault(M.start_state, [])
+        return cls(set(transition), transition, M.start_state, M.accept_states & live)
+    
+    # Regular Operations of Symbolic DFAs
+    def _minterm_operation(self, others, operation):
+        """
+        Returns the symbolic DFA of an operation on the minterm DFAs of the
+            symbolic DFA and other symbolic DFAs over their common minterms
+        """
+        starts = minterm_starts([self] + others)
+        M = operation(*(N.minterm_DFA(starts) for N in [self] + others))
+        return SymbolicDFA.from_minterm_DFA(M, starts)
+    
+    def __neg__(self):
+        """
+        Returns the complement of a symbolic DFA, over all the code points
+        """
+        return self._minterm_operation([], DFA.__neg__)
+    
+    def __and__(self, other):
+        """
+        Returns the intersection of two symbolic DFAs
+        """
+        return self._minterm_operation([other], DFA.intersection)
+    
     def __or__(self, other):
         """
-        Returns the union of two NFAs
+        Returns the union of two symbolic DFAs
         """
-        start_state = 'start'
-        states = self.states | other.states | {start_state}
-        alphabet = self.alphabet | other.alphabet
-        transition = self.transition.copy()
-        for state in self.states:
-            for symbol in other.alphabet - self.alphabet:
-                transition[state].update({symbol : set()})
-        for state in other.states:
-            transition[state] = {}
-            for symbol in alphabet | {''}:
-                if symbol in (other.alphabet | ''):
-                    transition[state].update({symbol : other.transition[state][symbol]})
-                else:
-                    transition[state].update({symbol : set()})
-        transition[start_state] = {}
-        transition[start_state].update({'' : {self.start_state, other.start_state}})
-        for symbol in alphabet:
-            transition[start_state].update({symbol : set()})
-        accept_states = self.accept_states | other.accept_states
-        return NFA(states, alphabet, transition, start_state, accept_states)
+        return self._minterm_operation([other], DFA.union)
     
-    def __add__(self, other):
+    def __sub__(self, other):
         """
-        Returns the concatenation of two NFAs
+        Returns the relative complement of a symbolic DFA from other symbolic DFA
         """
-        states = self.states | other.states
-        alphabet = self.alphabet | other.alphabet
-        transition = self.transition.copy()
-        for state in self.states:
-            transition[state] = {}
-            for symbol in other.alphabet - self.alphabet:
-                transition[state].update({symbol : set()})
-        for state in self.accept_states:
-            transition[state] = {}
-            transition[state].update({'' : transition[state][''] | {other.start_state}})
-        for state in other.states:
-            transition[state] = {}
-            for symbol in alphabet | {''}:
-                if symbol in (other.alphabet | ''):
-                    transition[state].update({symbol : other.transition[state][symbol]})
-                else:
-                    transition[state].update({symbol : set()})
-        return NFA(states, alphabet, transition, self.start_state, other.accept_states)
-        
-    def __mul__(self):
+        return self._minterm_operation([other], DFA.difference)
+    
+    def minimize(self):
         """
-        Returns the star of NFA
+        Returns the minimal equivalent symbolic DFA, minimized over its minterms
         """
-        start_state = 'q0`'
-        empty_string = ''
-        states = self.states | {start_state}
-        accept_states = self.accept_states | self.start_state
-        transition = {}
-        transition[start_state] = {}
-        transition[start_state].update({empty_string : {self.start_state}})
-        for symbol in self.alphabet:
-            transition[start_state].update({symbol : set()})
-        for state in self.state:
-            transition[symbol] = {}
-            if state in self.states - self.accept_states:
-                for symbol in (self.alphabet | empty_string):
-                    transition[state].update({symbol : self.transition[state][symbol]})
-            else:
-                for symbol in self.alphabet:
-                    transition[state].update({symbol : self.transition[state][symbol]})
-        for state in self.accept_states:
-            transition[state] = {}
-            transition[state].update({empty_string : self.transition[state][empty_string]} | {self.start_state})
-        return NFA(states, self.alphabet, transition, start_state, accept_states)
-                
+        return self._minterm_operation([], DFA.minimize)
     
-class RegEx():
+    def equivalent(self, other, witness=False):
+        """
+        Returns True if the symbolic DFA accepts the same strings as other
+            symbolic DFA, otherwise False, or the pair of the result and a
+            shortest string accepted by exactly one of them if witness is True
+        """
+        starts = minterm_starts([self, other])
+        string = distinguishing_string(self.minterm_DFA(starts), other.minterm_DFA(starts))
+        return (string is None, string) if witness else string is None
+
+
+class SymbolicNFA():
     """
-    Class for Regular Expression
+    Class for a Nondeterministic Finite Automaton whose transitions are
+        labelled with sets of characters as in SymbolicDFA, or with the empty
+        string ''
     
     Attributes
     ----------
-        string : str
-            input string to be verified as RegEx over the alphabet
-        alphabet : set
-            collection of symbols, default is binary
+        states : set
+            collection of states
+        transition : dict
+            transition function of the form transition[state] = [(intervals, state)]
+            where intervals is as returned by char_set(), or '' for an empty
+            string transition
+        start_state : str
+            the starting state
+        accept_states : set
+            the accepting or final states
     """
-    def __init__(self, string=str(), alphabet={'0', '1'}):
-        "Class Initialization"
-        self.string = string
-        self.alphabet = alphabet
+    
+    def __init__(self, states=set(), transition=dict, start_state=None, accept_states=set()):
+        "Class initialization"
+        self.states = states
+        self.transition = {state: [(intervals if intervals == '' else merge_intervals(intervals),
+                                    next_state) for intervals, next_state in pairs]
+                           for state, pairs in transition.items()}
+        self.start_state = start_state
+        self.accept_states = accept_states
+        self._closures = {}
     
     def __repr__(self):
-        "Class representation"
-        return "Regular Expression (RegEx) at " + f"{hex(id(self))}"\
-            + " over " + f"{self.alphabet}"
+        """
+        Class representation
+        """
+        return "Symbolic Nondeterministic Finite Automaton (NFA) at " + f"{hex(id(self))}"
     
-    def __str__(self):
-        "String representation"
-        return self.string
+    @classmethod
+    def from_NFA(cls, N):
+        """
+        Returns the symbolic NFA of an NFA whose symbols are single characters
+        """
+        transition = {}
+        for state in N.states:
+            targets = {}
+            for symbol, next_states in N.transition[state].items():
+                for next_state in next_states:
+                    targets.setdefault((symbol == '', next_state), []).append(symbol)
+            transition[state] = [('' if empty else char_set(*symbols), next_state)
+                                 for (empty, next_state), symbols in targets.items()]
+        return cls(set(N.states), transition, N.start_state, set(N.accept_states))
     
-    def parse_expression(self):
+    def reach(self, state):
+        """
+        Returns the reachable states of a state by following at least 0 empty
+            string transition, computed on first use
+        """
+        Reach = self._closures.get(state)
+        if Reach is None:
+            Reach = {state}
+            NewStates = [state]
+            while NewStates:
+                for intervals, next_state in self.transition.get(NewStates.pop(), []):
+                    if intervals == '' and next_state not in Reach:
+                        Reach.add(next_state)
+                        NewStates.append(next_state)
+            Reach = self._closures[state] = _frozenset(Reach)
+        return Reach
+    
+    def accepts(self, input_string=""):
+        """
+        Returns True if the symbolic NFA accepts the input string, read as in
+            SymbolicDFA.accepts(), otherwise False
+        """
+        states = self.reach(self.start_state)
+        for code in codes_of(input_string):
+            Reach = set()
+            for state in states:
+                for intervals, next_state in self.transition.get(state, []):
+                    if intervals != '':
+                        idx = bisect_right(intervals, (code, max_code_point)) - 1
+                        if idx >= 0 and code <= intervals[idx][1]:
+                            Reach |= self.reach(next_state)
+            states = Reach
+            if not states:
+                return False
+        return bool(states & self.accept_states)
+    
+    def to_DFA(self):
         """
+        Converts the symbolic NFA to a symbolic DFA over its minterms, building
+            only the nonempty sets of states reachable from the start state
         """
-        partitions = []
-        for symbol in self:
-            pass
+        starts = minterm_starts([self])
+        start_state = self.reach(self.start_state)
+        states = {start_state}
+        transition = {}
+        NewStates = [start_state]
+        while NewStates:
+            substates = NewStates.pop()
+            successors = {}
+            for state in substates:
+                for intervals, next_state in self.transition.get(state, []):
+                    if intervals != '':
+                        for idx in minterms_of(intervals, starts):
+                            successors.setdefault(idx, set()).update(self.reach(next_state))
+            targets = {}
+            for idx in sorted(successors):
+                targets.setdefault(_frozenset(successors[idx]), []).append(idx)
+            transition[substates] = [(intervals_of(minterms, starts), next_state)
+                                     for next_state, minterms in targets.items()]
+            for next_state in targets:
+                if next_state not in states:
+                    states.add(next_state)
+                    NewStates.append(next_state)
+        accept_states = {substates for substates in states if substates & self.accept_states}
+        return SymbolicDFA(states, transition, start_state, accept_states)
+
         
 class GNFA():
     """
-    Class for Generalized Nondeterministic Finite Automata
+    Class for Generalized Nondeterministic Finite Automata, whose transitions
+        are labelled with parse trees of regular expressions as in
+        parse_expression(), with a start state without incoming transitions and
+        a single accepting state without outgoing transitions
     
     Attributes
     ----------
         states : set
             collection of states
-        alphabet : set with the empty string ''
-            collection of symbols and empty string
+        alphabet : set
+            collection of symbols
         transition : dict
-            transition function of the form transition[state][states] = [RegEx]
+            transition function of the form transition[state][state] = parse tree,
+            without the transitions labelled with the empty set
         start_state : str
             the starting state
         accept_states : set
-            the accepting or final states
-    """
\ No newline at end of file
+            the accepting or final state
+    """
+    
+    def __init__(self, states=set(), alphabet=set(), transition=dict,
+                 start_state=None, accept_states=set()):
+        "Class initialization"
+        self.states = set(states)
+        self.alphabet = set(alphabet)
+        self.transition = transition
+        self.start_state = start_state
+        self.accept_states = set(accept_states)
+    
+    def __repr__(self):
+        """
+        Class representation
+        """
+        return "Generalized Nondeterministic Finite Automaton (GNFA) at " + f"{hex(id(self))}"
+    
+    @classmethod
+    def from_NFA(cls, N):
+        """
+        Returns the GNFA of a DFA or NFA, with its states reachable from the
+            start state numbered 1..n breadth-first, following the symbols and
+            the next states in the order of sorted_symbols() as in DFA.relabel()
+            so that the numbering does not depend on set order, the new start
+            state 0 and the new accepting state n + 1
+        """
+        symbols = sorted_symbols(N.alphabet) + ([''] if isinstance(N, NFA) else [])
+        labels = [N.start_state]
+        state_index = {N.start_state: 1}
+        idx = 0
+        while idx < len(labels):
+            state_transitions = N.transition[labels[idx]]
+            for symbol in symbols:
+                next_states = state_transitions.get(symbol, ())
+                for next_state in (sorted_symbols(next_states) if isinstance(N, NFA)
+                                   else [next_states]):
+                    if next_state not in state_index:
+                        state_index[next_state] = len(labels) + 1
+                        labels.append(next_state)
+            idx += 1
+        accept_state = len(state_index) + 1
+        transition = {0: {state_index[N.start_state]: ("epsilon",)}, accept_state: {}}
+        for state, idx in state_index.items():
+            terms = {}
+            for symbol, next_states in N.transition[state].items():
+                term = ("epsilon",) if symbol == '' else ("symbol", symbol)
+                for next_state in (next_states if isinstance(N, NFA) else [next_states]):
+                    terms.setdefault(state_index[next_state], []).append(term)
+            if state in N.accept_states:
+                terms.setdefault(accept_state, []).append(("epsilon",))
+            transition[idx] = {next_idx: regex_union(*next_terms)
+                               for next_idx, next_terms in terms.items()}
+        return cls(set(transition), N.alphabet, transition, 0, {accept_state})
+    
+    from_DFA = from_NFA
+    
+    def eliminate(self, state):
+        """
+        Removes a state other than the start and accepting states, replacing
+            each path p -> state -> q by the transition p -> q labelled with
+            the simplified term R(p, state) R(state, state)* R(state, q)
+        """
+        row = self.transition.pop(state)
+        self.states.discard(state)
+        loop = regex_star(row.pop(state, ("empty",)))
+        for other_state, other_row in self.transition.items():
+            if state not in other_row:
+                continue
+            term = regex_concat(other_row.pop(state), loop)
+            for next_state, next_term in row.items():
+                other_row[next_state] = regex_union(other_row.get(next_state, ("empty",)),
+                                                    regex_concat(term, next_term))
+    
+    def weight(self, state, incoming, sizes):
+        """
+        Returns the growth of the total size of the terms when eliminating a
+            state with the sets of states incoming[state] having a transition
+            to it: the sizes of the incoming terms repeated for each outgoing
+            transition, and conversely, and of the loop for each pair
+        """
+        row = self.transition[state]
+        sources = incoming[state] - {state}
+        targets = [next_state for next_state in row if next_state != state]
+        size_in = sum(regex_size(self.transition[other_state][state], sizes)
+                      for other_state in sources)
+        size_out = sum(regex_size(row[next_state], sizes) for next_state in targets)
+        size_loop = regex_size(row[state], sizes) if state in row else 0
+        return ((len(sources) - 1)*size_out + (len(targets) - 1)*size_in
+                + (len(sources)*len(targets) - 1)*size_loop)
+    
+    def to_tree(self):
+        """
+        Returns the parse tree of a regular expression of the strings accepted
+            by the GNFA, eliminating its states one at a time, each time the
+            state of lowest weight by GNFA.weight(), with its inputs multiplied
+            by its outputs. The GNFA is left with its start and accepting states
+        """
+        accept_state = next(iter(self.accept_states))
+        # Remove the states not on a path from the start state to the accepting state
+        reachable = {self.start_state}
+        NewStates = [self.start_state]
+        while NewStates:
+            for next_state in self.transition[NewStates.pop()]:
+                if next_state not in reachable:
+                    reachable.add(next_state)
+                    NewStates.append(next_state)
+        sources = {state: set() for state in self.states}
+        for state, row in self.transition.items():
+            for next_state in row:
+                sources[next_state].add(state)
+        alive = {accept_state}
+        NewStates = [accept_state]
+        while NewStates:
+            for state in sources[NewStates.pop()]:
+                if state not in alive:
+                    alive.add(state)
+                    NewStates.append(state)
+        for state in self.states - (reachable & alive) - {self.start_state, accept_state}:
+            del self.transition[state]
+        self.states = set(self.transition)
+        for row in self.transition.values():
+            for next_state in set(row) - self.states:
+                del row[next_state]
+        incoming = {state: set() for state in self.states}
+        for state, row in self.transition.items():
+            for next_state in row:
+                incoming[next_state].add(state)
+        sizes = {}
+        remaining = self.states - {self.start_state, accept_state}
+        weights = {state: self.weight(state, incoming, sizes) for state in remaining}
+        while remaining:
+            state = min(weights, key=lambda state: (weights[state], str(state)))
+            row = self.transition[state]
+            sources = incoming.pop(state) - {state}
+            targets = set(row) - {state}
+            self.eliminate(state)
+            remaining.discard(state)
+            del weights[state]
+            for next_state in targets:
+                incoming[next_state].discard(state)
+                incoming[next_state] |= sources
+            if len(sizes) > 1 << 16:
+                sizes.clear()
+            for other_state in (sources | targets) & remaining:
+                weights[other_state] = self.weight(other_state, incoming, sizes)
+        return self.transition[self.start_state].get(accept_state, ("empty",))
+    
+    def to_RegEx(self):
+        """
+        Returns the RegEx of the strings accepted by the GNFA, as in GNFA.to_tree()
+        """
+        return RegEx(regex_string(self.to_tree()), self.alphabet)